@@ -1,3 +1,6 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 from yhfinance.logger import MyLogger
 
@@ -5,6 +8,7 @@ from yhfinance.const.tickers import TickerType
 from yhfinance.const.databackup import UserConfig
 
 # from yhfinance.db_utils import DBFetcher
+from yhfinance.db_utils import DBMaintainer
 
 from yhfinance.databackup.tasks_factory import TaskForNewTicker
 from yhfinance.databackup.data_backup import DataBackup
@@ -16,6 +20,9 @@ MyLogger.setup()
 MyLogger.setProject('data-backup')
 logger = MyLogger()
 
+# Each ticker is pulled in its own process, bounded by the yfinance rate limit
+MAX_WORKERS = 4
+
 # Check if the ticker is really new
 # fetcher = DBFetcher()
 
@@ -32,7 +39,13 @@ logger = MyLogger()
 # all_ticker_list = [(config.ticker_name, config.ticker_type) for config in USER_TICKER_CONFIGS]
 all_ticker_list = [('^VIX', TickerType.Index)]
 
-for ticker_name, ticker_type in all_ticker_list:
+
+def _run_one(ticker: tuple[str, TickerType], staging_dir: str) -> str:
+    """Backup one ticker into its own staging DB, as SQLite does not allow parallel writers"""
+
+    ticker_name, ticker_type = ticker
+    staging_db = (Path(staging_dir) / f'{ticker_name}_{ticker_type.value}.db').as_posix()
+
     task_factory = TaskForNewTicker(ticker_name, ticker_type)
     tasks = task_factory.get_all_tasks()
 
@@ -42,5 +55,35 @@ for ticker_name, ticker_type in all_ticker_list:
         tasks = tasks
     )]
 
-    data_backuper = DataBackup(config)
+    data_backuper = DataBackup(config, db_name=staging_db)
     data_backuper.run()
+
+    return staging_db
+
+
+if __name__ == '__main__':
+
+    with tempfile.TemporaryDirectory() as staging_dir:
+
+        db_maintainer = DBMaintainer()
+
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(_run_one, ticker, staging_dir): ticker
+                       for ticker in all_ticker_list}
+
+            # Merge each staging DB as soon as its ticker is done, a failed ticker does not
+            # cost the others their data
+            for future in as_completed(futures):
+                ticker_name, ticker_type = futures[future]
+                try:
+                    staging_db = future.result()
+                except Exception as e:
+                    logger.error('Failed to backup ticker %s (%s)',
+                                 ticker_name, ticker_type.value, exc_info=e)
+                    continue
+
+                try:
+                    db_maintainer.merge_from(staging_db)
+                except Exception as e:
+                    logger.error('Failed to merge the staging DB of ticker %s (%s): %s',
+                                 ticker_name, ticker_type.value, staging_db, exc_info=e)
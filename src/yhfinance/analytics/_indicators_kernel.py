@@ -0,0 +1,269 @@
+"""Numeric kernels used by the indicators. They are compiled with numba when it is
+installed, otherwise the same code runs as plain python
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+__all__ = [
+    '_FDTYPE',
+    '_to_fd',
+    '_supertrend_core',
+    '_aroon_core',
+    '_wilder_smma',
+    '_wilder_smma_batch',
+    '_rolling_mean',
+    '_macd_core',
+    '_ewma',
+]
+
+# Float dtype the indicators are computed in. np.float32 halves the memory traffic but the
+# stored results lose precision, the kernels keep their running sums in float64 either way
+_FDTYPE = np.float64
+
+
+def _to_fd(values) -> np.ndarray:
+    """Return the Series / array as a _FDTYPE array, without a copy when it already is"""
+    return np.asarray(values, dtype=_FDTYPE)
+
+
+@njit(cache=True)
+def _supertrend_core(closes, base_ups, base_dns, period):
+    """Return (supertrend, modes, final_ups, final_dns), see
+    IndSupertrend._adjust_base_boundary_for_supertrend for the rules"""
+    n = len(closes)
+
+    # Every element from period on is written below, only the leading ones need NaN
+    supertrend = np.empty_like(closes)
+    modes = np.empty_like(closes)
+    final_ups = np.empty_like(closes)
+    final_dns = np.empty_like(closes)
+    supertrend[:period] = np.nan
+    modes[:period] = np.nan
+    final_ups[:period] = np.nan
+    final_dns[:period] = np.nan
+
+    if n <= period:
+        return supertrend, modes, final_ups, final_dns
+
+    final_ups[period] = base_ups[period]
+    final_dns[period] = base_dns[period]
+    supertrend[period] = base_ups[period]
+    # 1 for showing support, 0 for showing resistence
+    modes[period] = 1  # just a random pick
+
+    for idx in range(period+1, n):
+        # The previous resistence is too conservative
+        if closes[idx-1] > final_ups[idx-1]:
+            final_ups[idx] = base_ups[idx]
+        else:
+            final_ups[idx] = min(base_ups[idx], final_ups[idx-1])
+
+        # The previous resistence is too conservative
+        if closes[idx-1] < final_dns[idx-1]:
+            final_dns[idx] = base_dns[idx]
+        else:
+            final_dns[idx] = max(base_dns[idx], final_dns[idx-1])
+
+        # Break support, switch to resistence mode
+        if closes[idx] < final_dns[idx]:
+            modes[idx] = 0
+        # Break resistence, switch to support mode
+        elif closes[idx] > final_ups[idx]:
+            modes[idx] = 1
+        # Otherwise, just keep current trend
+        else:
+            modes[idx] = modes[idx-1]
+
+        supertrend[idx] = final_dns[idx] if modes[idx] == 1 else final_ups[idx]
+
+    return supertrend, modes, final_ups, final_dns
+
+
+@njit(cache=True)
+def _aroon_core(highs, lows, period):
+    """Return (aroon_ups, aroon_dns), the i-th value looks back at the highest high / lowest
+    low in [i-period, i), the earliest one wins a tie. Monotonic deques keep the
+    candidates, so each index is pushed and popped at most once"""
+    n = len(highs)
+
+    aroon_ups = np.empty_like(highs)
+    aroon_dns = np.empty_like(highs)
+    aroon_ups[:period] = np.nan
+    aroon_dns[:period] = np.nan
+
+    # Ring buffers never wrap as each index is pushed once, [head, tail) is the deque
+    dq_max = np.empty(n, dtype=np.int64)
+    dq_min = np.empty(n, dtype=np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+
+    for i in range(n):
+        if i >= period:
+            # Remove index outside the window
+            while dq_max[max_head] < i - period:
+                max_head += 1
+            while dq_min[min_head] < i - period:
+                min_head += 1
+
+            aroon_ups[i] = (period - (i - dq_max[max_head])) / period * 100
+            aroon_dns[i] = (period - (i - dq_min[min_head])) / period * 100
+
+        while max_tail > max_head and highs[dq_max[max_tail-1]] < highs[i]:
+            max_tail -= 1
+        dq_max[max_tail] = i
+        max_tail += 1
+
+        while min_tail > min_head and lows[dq_min[min_tail-1]] > lows[i]:
+            min_tail -= 1
+        dq_min[min_tail] = i
+        min_tail += 1
+
+    return aroon_ups, aroon_dns
+
+
+@njit(cache=True)
+def _wilder_smma(x, n):
+    """Wilder's smoothed moving average, i.e. y_t = (1-a) * y_t-1 + a * x_t with a = 1/n,
+    seeded at the n-th element with the mean of the first n elements. NaN are skipped
+    and keep the previous average, the same as ewm(ignore_na=True, adjust=False)"""
+    out = np.empty_like(x)
+    _wilder_smma_into(x, n, out)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _wilder_smma_batch(x, n):
+    """_wilder_smma on each row of the 2-D x, the rows are processed in parallel"""
+    out = np.empty_like(x)
+    for row in prange(x.shape[0]):
+        _wilder_smma_into(x[row], n, out[row])
+    return out
+
+
+@njit(cache=True)
+def _wilder_smma_into(x, n, out):
+    """Write _wilder_smma(x, n) into out, every element of out is written"""
+    out[:n] = np.nan
+    if len(x) <= n:
+        return
+
+    total = 0.
+    count = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+
+    alpha = 1. / n
+    avg = np.nan
+    for i in range(n, len(x)):
+        val = (total / count if count > 0 else np.nan) if i == n else x[i]
+        if not np.isnan(val):
+            avg = val if np.isnan(avg) else (1. - alpha) * avg + alpha * val
+        out[i] = avg
+
+
+@njit(cache=True)
+def _rolling_mean(x, n):
+    """Mean over the trailing window of n elements, NaN if the window is not full or has
+    any NaN, i.e. Series.rolling(n).mean(). The running sum is Kahan compensated, the
+    same way pandas does, so that it does not drift on long series"""
+    out = np.empty_like(x)
+
+    total = 0.
+    comp_add = 0.
+    comp_remove = 0.
+    valid_count = 0
+    nan_count = 0
+    for i in range(len(x)):
+        if i >= n:
+            if np.isnan(x[i-n]):
+                nan_count -= 1
+            else:
+                valid_count -= 1
+                if valid_count == 0:
+                    total = comp_add = comp_remove = 0.
+                else:
+                    y = -x[i-n] - comp_remove
+                    t = total + y
+                    comp_remove = (t - total) - y
+                    total = t
+
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            valid_count += 1
+            y = x[i] - comp_add
+            t = total + y
+            comp_add = (t - total) - y
+            total = t
+
+        out[i] = total / n if i >= n - 1 and nan_count == 0 else np.nan
+
+    return out
+
+
+@njit(cache=True)
+def _ewma_update(avg, old_wt, val, alpha):
+    """One step of ewm(alpha=alpha, adjust=False).mean() as pandas does it, NaN values
+    decay the weight of the current average. Return the updated (avg, old_wt)"""
+    if np.isnan(avg):
+        return (val, 1.) if not np.isnan(val) else (avg, old_wt)
+
+    old_wt *= 1. - alpha
+    if not np.isnan(val):
+        if avg != val:
+            avg = (old_wt * avg + alpha * val) / (old_wt + alpha)
+        old_wt = 1.
+    return avg, old_wt
+
+
+@njit(cache=True)
+def _macd_core(close, alpha_short, alpha_long, alpha_signal):
+    """Return (ema_short, ema_long, macd, signal) in one pass over close, each EMA is the
+    same as ewm(alpha=..., adjust=False).mean()"""
+    n = len(close)
+
+    ema_short = np.empty_like(close)
+    ema_long = np.empty_like(close)
+    macd = np.empty_like(close)
+    signal = np.empty_like(close)
+
+    avg_short = avg_long = avg_signal = np.nan
+    wt_short = wt_long = wt_signal = 1.
+    for i in range(n):
+        avg_short, wt_short = _ewma_update(avg_short, wt_short, close[i], alpha_short)
+        avg_long, wt_long = _ewma_update(avg_long, wt_long, close[i], alpha_long)
+        diff = avg_short - avg_long
+        avg_signal, wt_signal = _ewma_update(avg_signal, wt_signal, diff, alpha_signal)
+
+        ema_short[i] = avg_short
+        ema_long[i] = avg_long
+        macd[i] = diff
+        signal[i] = avg_signal
+
+    return ema_short, ema_long, macd, signal
+
+
+@njit(cache=True)
+def _ewma(x, alpha):
+    """The same as ewm(alpha=alpha, adjust=False).mean()"""
+    out = np.empty_like(x)
+
+    avg = np.nan
+    wt = 1.
+    for i in range(len(x)):
+        avg, wt = _ewma_update(avg, wt, x[i], alpha)
+        out[i] = avg
+
+    return out
@@ -1,5 +1,5 @@
 # 
-import heapq
+import weakref
 from typing import Optional, Union
 
 import numpy as np
@@ -14,6 +14,7 @@ from .ohlc_processor import OHLCInterProcessor
 from .ohlc_data import OHLCData, OHLCDataBase
 
 from ._indicators_mixin import *
+from ._indicators_kernel import *
 
 
 __all__ = [
@@ -33,6 +34,25 @@ __all__ = [
 # TODO - add related indicators as class property
 
 
+# The previous-tick join of each data, shared by all the indicators built on the same data
+_offset_df_cache: 'weakref.WeakKeyDictionary[OHLCData, tuple]' = weakref.WeakKeyDictionary()
+
+def _get_offset_df(data: OHLCData) -> pd.DataFrame:
+    """Return OHLCInterProcessor(data, tick_offset=-1)._df_offset, computed once per data.df
+    and tick_col. The frame is shared, do not modify it in place"""
+    _df_ref, _tick_col, _df_offset = _offset_df_cache.get(data, (None, None, None))
+    if _df_ref is None or _df_ref() is not data.df or _tick_col != data.tick_col:
+        _df_offset = OHLCInterProcessor(data, tick_offset=-1)._df_offset
+        _offset_df_cache[data] = (weakref.ref(data.df), data.tick_col, _df_offset)
+    return _df_offset
+
+
+def _to_plot(values) -> np.ndarray:
+    """Return the Series / array as float32 for mpf.make_addplot, single precision is plenty
+    for the lines and halves the data matplotlib has to convert"""
+    return np.asarray(values, dtype=np.float32)
+
+
 class _BaseIndicator(_PriceColMixin, OHLCDataBase, abc.ABC):
 
     # TODO - need to implement for each indicator
@@ -40,6 +60,8 @@ class _BaseIndicator(_PriceColMixin, OHLCDataBase, abc.ABC):
     _abbrev: str = 'undefined'
 
     def __init__(self, data: OHLCData, price_col: ColName = Col.Close):
+        # Keep the caller's data, intermediate results are cached on it across indicators
+        self._source_data = data
         super().__init__(data, price_col=price_col)
 
         self.calc()
@@ -78,6 +100,15 @@ class _BaseIndicator(_PriceColMixin, OHLCDataBase, abc.ABC):
         """Add the result df to self._df without causing duplicated columns.
         Need to make sure df contrains only the key column (tick_col) and desired results
         """
+        # Most results are computed row by row from self._df, assign the columns by position
+        # and only fall back to merging on tick_col when the rows do not line up
+        if (len(df.index) == len(self._df.index)
+            and np.array_equal(df[self.tick_col].to_numpy(), self._df[self.tick_col].to_numpy())):
+            for col in df.columns:
+                if col == self.tick_col:  continue
+                self._df[col] = df[col].to_numpy()
+            return
+
         drop_cols = []
         for col in df.columns:
             if col == self.tick_col:  continue
@@ -118,7 +149,7 @@ class IndSMA(_RollingMixin, _BaseIndicator):
     def make_addplot(self, plotter_args: dict, *args, **kwargs) -> list[dict]:
         return [
             mpf.make_addplot(
-                self._df[Col.Ind.SMA(self.period)],
+                _to_plot(self._df[Col.Ind.SMA(self.period)]),
                 type='line', panel=plotter_args['main_panel'],
                 label=Col.Ind.SMA(self.period)
             )
@@ -139,8 +170,8 @@ class IndEMA(_RollingMixin, _BaseIndicator):
     def _calc(self) -> pd.DataFrame:
 
         _df = self._df[[self.tick_col]].copy()
-        _df[Col.Ind.EMA(self.period)] = self.df[self.price_col.name].ewm(
-            span=self.period, adjust=False).mean()
+        _df[Col.Ind.EMA(self.period)] = _ewma(
+            _to_fd(self.df[self.price_col.name]), 2 / (self.period + 1))
 
         return _df
 
@@ -151,7 +182,7 @@ class IndEMA(_RollingMixin, _BaseIndicator):
     def make_addplot(self, plotter_args: dict, *args, **kwargs) -> list[dict]:
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.EMA(self.period)],
+                _to_plot(self.df[Col.Ind.EMA(self.period)]),
                 type='line', panel=plotter_args['main_panel'],
                 label=Col.Ind.EMA(self.period)
             )
@@ -174,12 +205,9 @@ class IndSMMA(_RollingMixin, _BaseIndicator):
 
         _df = self._df[[self.tick_col]].copy()
 
-        vals = self.df[self.price_col.name].copy()
-        vals.iloc[self.period] = vals.iloc[:self.period].mean()
-        vals.iloc[:self.period] = pd.NA
-        
-        alpha = 1 / self.period
-        _df[Col.Ind.SMMA(self.period)] = vals.ewm(alpha=alpha, ignore_na=True, adjust=False).mean()
+        # Seeded with the mean of the first n values, see _wilder_smma
+        _df[Col.Ind.SMMA(self.period)] = _wilder_smma(
+            _to_fd(self.df[self.price_col.name]), self.period)
 
         return _df
 
@@ -190,7 +218,7 @@ class IndSMMA(_RollingMixin, _BaseIndicator):
     def make_addplot(self, plotter_args: dict, *args, **kwargs) -> list[dict]:
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.SMMA(self.period)],
+                _to_plot(self.df[Col.Ind.SMMA(self.period)]),
                 type='line', panel=plotter_args['main_panel'],
                 label=Col.Ind.EMA(self.period)
             )
@@ -211,29 +239,26 @@ class IndMACD(_BaseIndicator):
         self.long_term_window  = long_term_window
         self.signal_window     = signal_window
 
+        self._col_macd   = Col.Ind.MACD.MACD(short_term_window, long_term_window, signal_window)
+        self._col_signal = Col.Ind.MACD.Signal(short_term_window, long_term_window, signal_window)
+
         super().__init__(data, price_col=price_col)
 
     def _calc(self) -> pd.DataFrame:
         
-        _ewm_short = IndEMA(self._data, period=self.short_term_window, price_col=self.price_col)
-        ewm_short = _ewm_short.df[Col.Ind.EMA(self.short_term_window)]
-
-        _ewm_long = IndEMA(self._data, period=self.long_term_window, price_col=self.price_col)
-        ewm_long = _ewm_long.df[Col.Ind.EMA(self.long_term_window)]
-
-        macd = ewm_short - ewm_long
-        signal = macd.ewm(span=self.signal_window, adjust=False).mean()
+        # The same as ewm(span=window, adjust=False) for the three EMAs, done in one pass
+        ewm_short, ewm_long, macd, signal = _macd_core(
+            _to_fd(self._df[self.price_col.name]),
+            2 / (self.short_term_window + 1),
+            2 / (self.long_term_window + 1),
+            2 / (self.signal_window + 1))
 
         df = self._df[[self.tick_col]].copy()
         
         df[Col.Ind.MACD.EMA12.name] = ewm_short
         df[Col.Ind.MACD.EMA26.name] = ewm_long
-        df[Col.Ind.MACD.MACD(
-            self.short_term_window, self.long_term_window, self.signal_window
-        )] = macd
-
-        df[Col.Ind.MACD.Signal(
-            self.short_term_window, self.long_term_window, self.signal_window)] = signal
+        df[self._col_macd] = macd
+        df[self._col_signal] = signal
 
         return df
 
@@ -247,36 +272,38 @@ class IndMACD(_BaseIndicator):
         main_panel = plotter_args['main_panel']
         new_panel_num = plotter_args['new_panel_num']
 
-        _col_macd = Col.Ind.MACD.MACD(
-            self.short_term_window, self.long_term_window, self.signal_window)
-        _col_signal = Col.Ind.MACD.Signal(
-            self.short_term_window, self.long_term_window, self.signal_window)
+        _col_macd = self._col_macd
+        _col_signal = self._col_signal
+
+        # One lookup for the four lines, float32 is plenty for plotting
+        cols = self.df[[Col.Ind.MACD.EMA12.name, Col.Ind.MACD.EMA26.name,
+                        _col_macd, _col_signal]].to_numpy(dtype=np.float32)
+        ema_short, ema_long, macd, signal = cols.T
+
+        # Add color to histogram, a bar is rising if it is higher than the previous one
+        histogram = macd - signal
+        histogram_prev = np.empty_like(histogram)
+        histogram_prev[0] = np.nan
+        histogram_prev[1:] = histogram[:-1]
+        is_rising = histogram > histogram_prev
 
-        # Add color to histogram
-        histogram = (self.df[_col_macd] -  self.df[_col_signal]).values
         # Rising trend
-        histogram_rise = np.full_like(histogram, np.nan)
+        histogram_rise = np.where(is_rising, histogram, np.nan)
         # Decreasing trend 
-        histogram_fall = np.full_like(histogram, np.nan)
-
-        for idx, val in enumerate(histogram[1:]):
-            if val > histogram[idx-1]:
-                histogram_rise[idx] = histogram[idx]
-            else:
-                histogram_fall[idx] = histogram[idx]
+        histogram_fall = np.where(is_rising, np.nan, histogram)
 
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.MACD.EMA12.name], linestyle='--',
+                ema_short, linestyle='--',
                 panel=main_panel, label='MACD-EMA12'),
             mpf.make_addplot(
-                self.df[Col.Ind.MACD.EMA26.name], linestyle=':',
+                ema_long, linestyle=':',
                 panel=main_panel, label='MACD-EMA26'),
             # 
-            mpf.make_addplot(self.df[_col_macd],
+            mpf.make_addplot(macd,
                              color='fuchsia', panel=new_panel_num,
                              label='MACD', secondary_y=True),
-            mpf.make_addplot(self.df[_col_signal],
+            mpf.make_addplot(signal,
                              color='b', panel=new_panel_num, label='Signal', secondary_y=True),
             # TODO - use style value from mplfinance
             # TODO - check how does mpf implement the volume
@@ -293,14 +320,8 @@ class IndMACD(_BaseIndicator):
         return {
             'Short': self.df[Col.Ind.MACD.EMA12].values,
             'Long': self.df[Col.Ind.MACD.EMA26].values,
-            'MACD': self.df[
-                Col.Ind.MACD.MACD(
-                    self.short_term_window, self.long_term_window, self.signal_window)
-            ].values,
-            'Signal': self.df[
-                Col.Ind.MACD.Signal(
-                    self.short_term_window, self.long_term_window, self.signal_window)
-            ].values,
+            'MACD': self.df[self._col_macd].values,
+            'Signal': self.df[self._col_signal].values,
         }
 
 class _IndRSI(_RollingMixin, _BaseIndicator):
@@ -315,6 +336,12 @@ class _IndRSI(_RollingMixin, _BaseIndicator):
         self.ewm_ups: pd.DataFrame
         self.ewm_dns: pd.DataFrame
         self.threshold = threshold
+
+        self._col_avg_gain = self.rsi_col.AvgGain(period)
+        self._col_avg_loss = self.rsi_col.AvgLoss(period)
+        self._col_rs       = self.rsi_col.RS(period)
+        self._col_rsi      = self.rsi_col.RSI(period)
+
         super().__init__(data, period=period, price_col=price_col)
 
     @property
@@ -323,23 +350,23 @@ class _IndRSI(_RollingMixin, _BaseIndicator):
 
     def _get_gl_for_rsi(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
 
-        _inter_processor = OHLCInterProcessor(self._data, tick_offset=-1)
-        _inter_processor.add_all_return()
-        _col_res = Col.Inter.get_return_col(self.price_col)
-            
-        _df = _inter_processor.get_result()
-        _df = _df[[self.tick_col, _col_res.gl]].copy()
+        # Only the gain / loss of price_col is needed, no need to add all the returns
+        _df_offset = _get_offset_df(self._source_data)
+        _df = _df_offset[[self.tick_col]].copy()
 
-        ups = _df[_col_res.gl].apply(lambda x: max(x, 0))
-        dns = _df[_col_res.gl].apply(lambda x: -min(x, 0))
-        _df.drop(columns=[_col_res.gl], inplace=True)
+        _gl = _to_fd(_df_offset[self.price_col.cur]) - _to_fd(_df_offset[self.price_col.sft])
+        ups = pd.Series(np.clip(_gl, 0., None), index=_df.index)
+        dns = pd.Series(np.clip(-_gl, 0., None), index=_df.index)
 
         return _df, ups, dns
 
-    @property
-    @abc.abstractmethod
-    def rsi_col(self) -> _T_RSI:
-        """Return the col used for this type of RSI"""
+    # The col used for this type of RSI, set by each subclass
+    rsi_col: _T_RSI
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not isinstance(getattr(cls, 'rsi_col', None), _T_RSI):
+            raise TypeError(f'{cls.__name__} must set the class attribute rsi_col to a Col.Ind RSI col')
 
     @property
     def rsi_type(self) -> str:
@@ -347,14 +374,14 @@ class _IndRSI(_RollingMixin, _BaseIndicator):
 
     @property
     def values(self) -> ArrayLike | dict[str, ArrayLike] | list[ArrayLike] | tuple[ArrayLike, ...]:
-        return self.df[self.rsi_col.RSI(self.period)].values
+        return self.df[self._col_rsi].values
 
     def _assign_rsi_result(self, df) -> pd.DataFrame:
         
-        df[self.rsi_col.AvgGain(self.period)] = self.ewm_ups
-        df[self.rsi_col.AvgLoss(self.period)] = self.ewm_dns
-        df[self.rsi_col.RS(self.period)] = self.ewm_ups / self.ewm_dns
-        df[self.rsi_col.RSI(self.period)] = 100 - (100 / (1 + self.ewm_ups / self.ewm_dns))
+        df[self._col_avg_gain] = self.ewm_ups
+        df[self._col_avg_loss] = self.ewm_dns
+        df[self._col_rs] = self.ewm_ups / self.ewm_dns
+        df[self._col_rsi] = 100 - (100 / (1 + df[self._col_rs]))
 
         return df
 
@@ -362,21 +389,20 @@ class _IndRSI(_RollingMixin, _BaseIndicator):
 
         new_panel_num = plotter_args['new_panel_num']
 
-        _df_threshold = pd.DataFrame.from_dict({
-            'upper': [max(self.threshold)] * len(self.df),
-            'lower': [min(self.threshold)] * len(self.df)
-        })
+        # Constant lines, read-only views of a single float32 instead of N values each
+        _upper = np.broadcast_to(np.float32(max(self.threshold)), len(self.df))
+        _lower = np.broadcast_to(np.float32(min(self.threshold)), len(self.df))
         
         return [
-            mpf.make_addplot(self.df[self.rsi_col.RSI(self.period)],
+            mpf.make_addplot(_to_plot(self.df[self._col_rsi]),
                              type='line', color='r',
-                             label=self.rsi_col.RSI(self.period),
+                             label=self._col_rsi,
                              panel=new_panel_num, secondary_y=False),
             #
-            mpf.make_addplot(_df_threshold['upper'], type='line', color='k',
+            mpf.make_addplot(_upper, type='line', color='k',
                              linestyle='--', panel=new_panel_num, secondary_y=False),
             #
-            mpf.make_addplot(_df_threshold['lower'], type='line', color='k',
+            mpf.make_addplot(_lower, type='line', color='k',
                              linestyle='--', panel=new_panel_num, secondary_y=False)
         ]
 
@@ -388,40 +414,46 @@ class IndWilderRSI(_IndRSI):
         result starts from nth element as the
     """
 
-    @property
-    def rsi_col(self) -> _T_RSI:
-        return Col.Ind.RSIWilder
+    rsi_col: _T_RSI = Col.Ind.RSIWilder
 
     def _calc(self) -> pd.DataFrame:
         _df, ups, dns = self._get_gl_for_rsi()
         n = self.period
 
-        ups.iloc[n] = ups.iloc[:n].mean()
-        ups.iloc[:n] = pd.NA
-        dns.iloc[n] = dns.iloc[:n].mean()
-        dns.iloc[:n] = pd.NA
-
-        alpha = 1 / n
-        self.ewm_ups = ups.ewm(alpha=alpha, ignore_na=True, adjust=False).mean()
-        self.ewm_dns = dns.ewm(alpha=alpha, ignore_na=True, adjust=False).mean()
+        self.ewm_ups = pd.Series(_wilder_smma(_to_fd(ups), n), index=ups.index)
+        self.ewm_dns = pd.Series(_wilder_smma(_to_fd(dns), n), index=dns.index)
 
         return self._assign_rsi_result(_df)
 
+    @classmethod
+    def batch(cls, prices: ArrayLike, period: int = 14) -> np.ndarray:
+        """Wilder's RSI of many tickers in one call, prices is a 2-D array with one row per
+        ticker and ticks along the columns. Return an array of the same shape, the first
+        column is NaN as there is no previous price"""
+        _prices = np.atleast_2d(_to_fd(prices))
+        _gl = _prices[:, 1:] - _prices[:, :-1]
+
+        ewm_ups = _wilder_smma_batch(np.clip(_gl, 0., None), period)
+        ewm_dns = _wilder_smma_batch(np.clip(-_gl, 0., None), period)
+
+        ret = np.full_like(_prices, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret[:, 1:] = 100 - (100 / (1 + ewm_ups / ewm_dns))
+        return ret
+
 
 class IndEmaRSI(_IndRSI):
     """The main difference from wilder's original is that instead of SMMA,
     we used a EMA so that the first n obs are NOT nan"""
 
-    @property
-    def rsi_col(self) -> _T_RSI:
-        return Col.Ind.RSIEma
+    rsi_col: _T_RSI = Col.Ind.RSIEma
 
     def _calc(self) -> None:
         _df, ups, dns = self._get_gl_for_rsi()
 
         alpha = 1 / self.period
-        self.ewm_ups = ups.ewm(alpha=alpha, adjust=False).mean()
-        self.ewm_dns = dns.ewm(alpha=alpha, adjust=False).mean()
+        self.ewm_ups = pd.Series(_ewma(_to_fd(ups), alpha), index=ups.index)
+        self.ewm_dns = pd.Series(_ewma(_to_fd(dns), alpha), index=dns.index)
 
         return self._assign_rsi_result(_df)
 
@@ -429,15 +461,13 @@ class IndEmaRSI(_IndRSI):
 class IndCutlerRSI(_IndRSI):
     """Cutler's RSI variation is based on SMA, to overcome the so-called 'Data Length Dependency'"""
 
-    @property
-    def rsi_col(self) -> _T_RSI:
-        return Col.Ind.RSICutler
+    rsi_col: _T_RSI = Col.Ind.RSICutler
 
     def _calc(self) -> None:
         _df, ups, dns = self._get_gl_for_rsi()
 
-        self.ewm_ups = ups.rolling(self.period).mean()
-        self.ewm_dns = dns.rolling(self.period).mean()
+        self.ewm_ups = pd.Series(_rolling_mean(_to_fd(ups), self.period), index=ups.index)
+        self.ewm_dns = pd.Series(_rolling_mean(_to_fd(dns), self.period), index=dns.index)
 
         return self._assign_rsi_result(_df)
 
@@ -450,14 +480,16 @@ class IndTrueRange(_BaseIndicator):
         super().__init__(data, price_col=price_col)
 
     def _calc(self) -> pd.DataFrame:
-        _df = OHLCInterProcessor(self._data, tick_offset=-1)._df_offset
+        _df = _get_offset_df(self._source_data).copy()
+
+        _high = _to_fd(_df[Col.High.cur])
+        _low = _to_fd(_df[Col.Low.cur])
+        _close_prev = _to_fd(_df[Col.Close.sft])
 
-        # TR = max[(H-L), abs(H-Cp), abs(L-Cp)]
-        _df[Col.Ind.TrueRange] = pd.concat([
-            _df[Col.High.cur] - _df[Col.Low.cur],
-            (_df[Col.High.cur] - _df[Col.Close.sft]).abs(),
-            (_df[Col.Low.cur] - _df[Col.Close.sft]).abs()
-            ], axis=1).max(axis=1)
+        # TR = max[(H-L), abs(H-Cp), abs(L-Cp)], fmax skips NaN like DataFrame.max does
+        _df[Col.Ind.TrueRange] = np.fmax(
+            np.fmax(_high - _low, np.abs(_high - _close_prev)),
+            np.abs(_low - _close_prev))
 
         return _df
 
@@ -489,12 +521,8 @@ class IndAvgTrueRange(_RollingMixin, _BaseIndicator):
         ind_tr = IndTrueRange(self._data, price_col=self.price_col)
         _df = ind_tr.get_result()
 
-        _tr = _df[Col.Ind.TrueRange.name].copy()
-        _tr.iloc[period] = _tr.iloc[:period].mean()
-        _tr.iloc[:period] = pd.NA
-
-        alpha = 1 / period
-        _df[Col.Ind.AvgTrueRange(period)] = _tr.ewm(alpha=alpha, ignore_na=True, adjust=False).mean()
+        _tr = _to_fd(_df[Col.Ind.TrueRange.name])
+        _df[Col.Ind.AvgTrueRange(period)] = _wilder_smma(_tr, period)
 
         if not self.keep_tr_result:
             _df = _df[[self.tick_col, Col.Ind.AvgTrueRange(period)]]
@@ -516,7 +544,7 @@ class IndAvgTrueRange(_RollingMixin, _BaseIndicator):
 
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.AvgTrueRange(self.period)],
+                _to_plot(self.df[Col.Ind.AvgTrueRange(self.period)]),
                 type='line',
                 panel=plotter_args['new_panel_num'],
                 label=Col.Ind.AvgTrueRange(self.period)
@@ -544,14 +572,10 @@ class IndATRBand(_BandMixin, IndAvgTrueRange):
     def _calc(self) -> pd.DataFrame:
         _df = super()._calc()
 
-        _df['PlotUp'] = (
-            _df[self.shift_ref_col.name]
-            + self.multiplier * _df[Col.Ind.AvgTrueRange(self.period)]
-        )
-        _df['PlotDn'] = (
-            _df[self.shift_ref_col.name]
-            - self.multiplier * _df[Col.Ind.AvgTrueRange(self.period)]
-        )
+        _ref = _to_fd(_df[self.shift_ref_col.name])
+        _band = self.multiplier * _to_fd(_df[Col.Ind.AvgTrueRange(self.period)])
+        _df['PlotUp'] = _ref + _band
+        _df['PlotDn'] = _ref - _band
 
         return _df
 
@@ -560,10 +584,10 @@ class IndATRBand(_BandMixin, IndAvgTrueRange):
 
         return [
             mpf.make_addplot(
-                self.df['PlotUp'],
+                _to_plot(self.df['PlotUp']),
                 fill_between = {
-                    'y1': self.df['PlotUp'].values,
-                    'y2': self.df['PlotDn'].values,
+                    'y1': _to_plot(self.df['PlotUp']),
+                    'y2': _to_plot(self.df['PlotDn']),
                     'alpha': 0.3,
                     'color': 'dimgray',
                 },
@@ -604,6 +628,9 @@ class IndSupertrend(_RollingMixin, _BandMixin, _BaseIndicator):
     green color whereas sell signal is given as the indicator turns red. A
     sell signal occurs when it closes above the price. """
 
+    # The ATR result only depends on the data and period, not on the multipliers
+    _atr_cache: 'weakref.WeakKeyDictionary[OHLCData, tuple[weakref.ref, dict]]' = weakref.WeakKeyDictionary()
+
     def __init__(
             self,
             data          : OHLCData,
@@ -615,6 +642,19 @@ class IndSupertrend(_RollingMixin, _BandMixin, _BaseIndicator):
                          period=period,
                          multiplier=multiplier, multiplier_dn=multiplier_dn)
 
+    def _get_atr_result(self, period: int) -> pd.DataFrame:
+        """Return a copy of the IndAvgTrueRange result, reusing the one computed for the same
+        data and period. Replacing data.df invalidates the cache, in-place edits do not"""
+        _df_ref, _cache = self._atr_cache.get(self._source_data, (None, {}))
+        if _df_ref is None or _df_ref() is not self._source_data.df:
+            _cache = {}
+            self._atr_cache[self._source_data] = (weakref.ref(self._source_data.df), _cache)
+
+        _key = (self.tick_col, period)
+        if _key not in _cache:
+            _cache[_key] = IndAvgTrueRange(self._data, period).get_result()
+        return _cache[_key].copy()
+
     @property
     def _col_supertrend_name(self) -> str:
         if self._multi_dn == self._multi_up:
@@ -627,8 +667,7 @@ class IndSupertrend(_RollingMixin, _BandMixin, _BaseIndicator):
         _multi_up = self._multi_up
         _multi_dn = self._multi_dn
 
-        ind_atr = IndAvgTrueRange(self._data, period)
-        _df = ind_atr.get_result()
+        _df = self._get_atr_result(period)
 
         # NOTE - the rolling min is one way to use but that will introduce another paratermeter for the
         #        window size
@@ -676,45 +715,11 @@ class IndSupertrend(_RollingMixin, _BandMixin, _BaseIndicator):
         _multi_up = self._multi_up
         _multi_dn = self._multi_dn
 
-        closes = _df[Col.Close.cur].to_list()
-        base_ups = _df[Col.Ind.SuperTrend.Up(period, _multi_up)].to_list()
-        base_dns = _df[Col.Ind.SuperTrend.Dn(period, _multi_dn)].to_list()
-
-        modes = [np.nan] * len(_df)
-        supertrend = np.full((len(_df),), np.nan)
-        final_ups = np.full((len(_df),), np.nan)
-        final_dns = np.full((len(_df),), np.nan)
-
-        final_ups[period] = base_ups[period]
-        final_dns[period] = base_dns[period]
-        supertrend[period] = base_ups[period]
-        # 1 for showing support, 0 for showing resistence
-        modes[period] = 1  # just a random pick
-
-        for idx in range(period+1, len(_df)):
-            # The previous resistence is too conservative
-            if closes[idx-1] > final_ups[idx-1]:
-                final_ups[idx] = base_ups[idx]
-            else:
-                final_ups[idx] = min(base_ups[idx], final_ups[idx-1])
-                
-            # The previous resistence is too conservative
-            if closes[idx-1] < final_dns[idx-1]:
-                final_dns[idx] = base_dns[idx]
-            else:
-                final_dns[idx] = max(base_dns[idx], final_dns[idx-1])
-
-            # Break support, switch to resistence mode
-            if closes[idx] < final_dns[idx]:
-                modes[idx] = 0
-            # Break resistence, switch to support mode
-            elif closes[idx] > final_ups[idx]:
-                modes[idx] = 1
-            # Otherwise, just keep current trend
-            else:
-                modes[idx] = modes[idx-1]
+        closes = _to_fd(_df[Col.Close.cur])
+        base_ups = _to_fd(_df[Col.Ind.SuperTrend.Up(period, _multi_up)])
+        base_dns = _to_fd(_df[Col.Ind.SuperTrend.Dn(period, _multi_dn)])
 
-            supertrend[idx] = final_dns[idx] if modes[idx] == 1 else final_ups[idx]
+        supertrend, modes, _, _ = _supertrend_core(closes, base_ups, base_dns, period)
 
         return supertrend, modes
 
@@ -738,37 +743,39 @@ class IndSupertrend(_RollingMixin, _BandMixin, _BaseIndicator):
         kwargs_dn = {'color': 'lime', **kwargs}
 
 
-        _df_up = self.df.copy()
-        _df_up.loc[_df_up[Col.Ind.SuperTrend.Mode.name] == 1, self._col_supertrend_name] = pd.NA
-        ups = _df_up[self._col_supertrend_name].values
-        
-        _df_dn = self.df.copy()
-        _df_dn.loc[_df_dn[Col.Ind.SuperTrend.Mode.name] == 0, self._col_supertrend_name] = pd.NA
-        dns = _df_dn[self._col_supertrend_name].values
+        # One lookup for all the columns needed, float32 is plenty for plotting
+        _cols = [self._col_supertrend_name, Col.Ind.SuperTrend.Mode.name]
+        if with_raw_atr_band:
+            _cols += [Col.Ind.SuperTrend.Up(period, _multi_up),
+                      Col.Ind.SuperTrend.Dn(period, _multi_dn)]
+        values = self.df[_cols].to_numpy(dtype=np.float32)
+        supertrend, modes = values[:, 0], values[:, 1]
+
+        # Resistence line is shown in resistence mode (0), support line in support mode (1)
+        ups = np.where(modes == 1, np.nan, supertrend)
+        dns = np.where(modes == 0, np.nan, supertrend)
 
         s2r_markers = np.full((len(dns)), np.nan)
         r2s_markers = np.full((len(dns)), np.nan)
 
-        modes = self.df[Col.Ind.SuperTrend.Mode.name].values
         # Locate the transition point, add markes and fill in the gap
-        for idx, mode in enumerate(modes[:-1]):
-            if mode not in {0, 1}: continue  # first n points are NA
-
-            if mode != modes[idx+1]:
-                # support to resistence: fall breach the support, red line, red downward arrow above
-                if mode == 1: 
-                    ups[idx] = dns[idx]
-                    # TODO - add markers
-                    s2r_markers[idx+1] = ups[idx+1] * 1.05
-                else:
-                    # resistence to support: risk breach the resistence, green line, green upward arrow below
-                    dns[idx] = ups[idx]
-                    r2s_markers[idx+1] = dns[idx+1] * 0.95
+        # NOTE - first n points are NA, they never equal to 0 or 1
+        _changed = ((modes[:-1] == 0) | (modes[:-1] == 1)) & (modes[:-1] != modes[1:])
+        # support to resistence: fall breach the support, red line, red downward arrow above
+        _s2r_idx = np.flatnonzero(_changed & (modes[:-1] == 1))
+        # resistence to support: risk breach the resistence, green line, green upward arrow below
+        _r2s_idx = np.flatnonzero(_changed & (modes[:-1] == 0))
+
+        s2r_markers[_s2r_idx + 1] = ups[_s2r_idx + 1] * 1.05
+        r2s_markers[_r2s_idx + 1] = dns[_r2s_idx + 1] * 0.95
+        ups[_s2r_idx] = dns[_s2r_idx]
+        dns[_r2s_idx] = ups[_r2s_idx]
 
         if with_raw_atr_band:
-            kwargs['fill_between'] = {
-                'y1': self.df[Col.Ind.SuperTrend.Up(period, _multi_up)].values,
-                'y2': self.df[Col.Ind.SuperTrend.Dn(period, _multi_dn)].values,
+            # kwargs_up is already built, the band goes with the resistence line
+            kwargs_up['fill_between'] = {
+                'y1': values[:, 2],
+                'y2': values[:, 3],
                 'alpha': 0.3,
                 'color': 'dimgray'
             }
@@ -850,13 +857,13 @@ class IndStarcBand(_BandMixin, _BaseIndicator):
 
         if fill_band:
             kwargs['fill_between'] = {
-                'y1': self.df[Col.Ind.STARC.Up(self.period_sma, self.period_atr)].values,
-                'y2': self.df[Col.Ind.STARC.Dn(self.period_sma, self.period_atr)].values,
+                'y1': _to_plot(self.df[Col.Ind.STARC.Up(self.period_sma, self.period_atr)]),
+                'y2': _to_plot(self.df[Col.Ind.STARC.Dn(self.period_sma, self.period_atr)]),
                 'alpha': 0.3,
                 'color': 'dimgray',
             }
         
-        ret = [mpf.make_addplot(self.df[Col.Close.name], **kwargs)]
+        ret = [mpf.make_addplot(_to_plot(self.df[Col.Close.name]), **kwargs)]
 
         if with_sma:
             # Ensure we have the same size
@@ -889,34 +896,11 @@ class IndAroon(_RollingMixin, _BaseIndicator):
 
         _df = self.df[[self.tick_col]].copy()
 
-        highs = self.df[Col.High.name].values
-        lows = self.df[Col.Low.name].values
-
-        aroon_ups = np.full((len(_df),), np.nan)
-        aroon_dns = np.full((len(_df),), np.nan)
-
-        min_heap = []
-        max_heap = []
-
-        for i in range(self.period):
-            heapq.heappush(min_heap, (lows[i], i))
-            heapq.heappush(max_heap, (-highs[i], i))
+        highs = _to_fd(self.df[Col.High.name])
+        lows = _to_fd(self.df[Col.Low.name])
 
-        for i in range(self.period, len(_df)):
+        aroon_ups, aroon_dns = _aroon_core(highs, lows, self.period)
 
-            # Remove index outside the window
-            self.__clean_heap(min_heap, i - self.period)
-            self.__clean_heap(max_heap, i - self.period)
-
-            min_idx = min_heap[0][1]
-            max_idx = max_heap[0][1]
-
-            aroon_ups[i] = (self.period - (i - max_idx)) / (self.period) * 100
-            aroon_dns[i] = (self.period - (i - min_idx)) / (self.period) * 100
-
-            heapq.heappush(min_heap, (lows[i], i))
-            heapq.heappush(max_heap, (-highs[i], i))
-        
         _df[Col.Ind.Aroon.Up(self.period)] = aroon_ups
         _df[Col.Ind.Aroon.Dn(self.period)] = aroon_dns
 
@@ -929,12 +913,6 @@ class IndAroon(_RollingMixin, _BaseIndicator):
             'Dn': self.df[Col.Ind.Aroon.Dn(self.period)].values
         }
 
-    @staticmethod
-    def __clean_heap(heap, min_index):
-
-        while heap and heap[0][1] < min_index:
-            heapq.heappop(heap)
-        
     @property
     def need_new_panel_num(self) -> bool:
         return True
@@ -944,17 +922,17 @@ class IndAroon(_RollingMixin, _BaseIndicator):
         # TODO - need to add color following style
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.Aroon.Up(self.period)],
+                _to_plot(self.df[Col.Ind.Aroon.Up(self.period)]),
                 type='line', panel=plotter_args['new_panel_num'],
                 color='lime', secondary_y = False
             ),
             mpf.make_addplot(
-                self.df[Col.Ind.Aroon.Dn(self.period)],
+                _to_plot(self.df[Col.Ind.Aroon.Dn(self.period)]),
                 type='line', panel=plotter_args['new_panel_num'],
                 color='red', secondary_y = False
             ),
             mpf.make_addplot(
-                (self.df[Col.Ind.Aroon.Up(self.period)] - self.df[Col.Ind.Aroon.Dn(self.period)]),
+                _to_plot(self.df[Col.Ind.Aroon.Up(self.period)] - self.df[Col.Ind.Aroon.Dn(self.period)]),
                 type='line', panel=plotter_args['new_panel_num'],
                 color='k', linestyle='--', secondary_y = True
             )
@@ -1021,7 +999,7 @@ class IndAwesomeOscillator(_BaseIndicator):
         }
 
         ret = [mpf.make_addplot(
-            self.df[Col.Ind.AwesomeOscillator.AO(self.period_fast, self.period_slow)],
+            _to_plot(self.df[Col.Ind.AwesomeOscillator.AO(self.period_fast, self.period_slow)]),
             **kwargs)]
 
         if with_sma:
@@ -1102,15 +1080,15 @@ class IndBollingerBand(_RollingMixin, _BandMixin, _BaseIndicator):
             'label': Col.Ind.BollingerBand.BB(self.period, *args),
             'secondary_y': False,
             'fill_between': {
-                'y1': self.df[Col.Ind.BollingerBand.Up(self.period, self._multi_up)].values,
-                'y2': self.df[Col.Ind.BollingerBand.Dn(self.period, self._multi_dn)].values,
+                'y1': _to_plot(self.df[Col.Ind.BollingerBand.Up(self.period, self._multi_up)]),
+                'y2': _to_plot(self.df[Col.Ind.BollingerBand.Dn(self.period, self._multi_dn)]),
                 'alpha': 0.3,
                 'color': 'dimgray',
             }
         }
 
         return [
-            mpf.make_addplot(self.df[Col.Ind.BollingerBand.SMA(self.period)], **kwargs)
+            mpf.make_addplot(_to_plot(self.df[Col.Ind.BollingerBand.SMA(self.period)]), **kwargs)
         ]
 
 
@@ -1174,15 +1152,15 @@ class IndBollingerBandModified(IndBollingerBand):
             'label': Col.Ind.BollingerBandModified.BB(self.period, *args),
             'secondary_y': False,
             'fill_between': {
-                'y1': self.df[Col.Ind.BollingerBandModified.Up(self.period, self._multi_up)].values,
-                'y2': self.df[Col.Ind.BollingerBandModified.Dn(self.period, self._multi_dn)].values,
+                'y1': _to_plot(self.df[Col.Ind.BollingerBandModified.Up(self.period, self._multi_up)]),
+                'y2': _to_plot(self.df[Col.Ind.BollingerBandModified.Dn(self.period, self._multi_dn)]),
                 'alpha': 0.3,
                 'color': 'dimgray',
             }
         }
 
         return [
-            mpf.make_addplot(self.df[Col.Ind.BollingerBandModified.SMA(self.period)], **kwargs)
+            mpf.make_addplot(_to_plot(self.df[Col.Ind.BollingerBandModified.SMA(self.period)]), **kwargs)
         ]
 
 
@@ -1278,7 +1256,7 @@ class IndMoneyFlowIndex(_RollingMixin, _BaseIndicator):
 
         return [
             mpf.make_addplot(
-                self.df[Col.Ind.MFI.MFI(self.period)],
+                _to_plot(self.df[Col.Ind.MFI.MFI(self.period)]),
                 type='line', panel=plotter_args['new_panel_num'],
                 label=Col.Ind.MFI.MFI(self.period)
             )
@@ -1,4 +1,5 @@
 
+from collections import defaultdict
 from typing import Optional, Literal
 
 import seaborn as sns
@@ -17,6 +18,9 @@ _T_TYPE_LITERAL = Literal['candle', 'renko', 'pnf', 'ohlc', 'line', 'hnf']
 class OHLCMpfPlotter:
     _T_TYPE_LITERAL = _T_TYPE_LITERAL
 
+    # Panel numbers handed out by get_new_panel_num are within range(0, 33)
+    _ALL_PANELS_MASK = (1 << 33) - 1
+
     def __init__(
             self,
             tick_col: str,  # the columnt used as index
@@ -44,16 +48,20 @@ class OHLCMpfPlotter:
         self.tight_layout = tight_layout
         self.noshow = noshow
 
-        self.main_panel: int = main_panel
-        self.volume: bool = volume
-        self.volume_panel: int = volume_panel
+        # Cached base of plotter_args, any setter below marks it dirty
+        self._cached_args: dict = {}
+        self._args_dirty: bool = True
+
+        self._main_panel: int = main_panel
+        self._volume: bool = volume
+        self._volume_panel: int = volume_panel
 
-        self.figscale = figscale
-        self.figratio = figratio
-        self.figsize = figsize
-        self.style = style
+        self._figscale = figscale
+        self._figratio = figratio
+        self._figsize = figsize
+        self._style = style
         self._panel_ratios = panel_ratios
-        self.figure_title = title
+        self._figure_title = title
 
         self.move_legend_outside = move_legend_outside
         self.merge_legend_for_each_panel = merge_legend_for_each_panel
@@ -74,22 +82,25 @@ class OHLCMpfPlotter:
 
     def reset(self):
         self._taken_panel_nums = []
+        # Bit i is set when panel i is taken by an indicator
+        self._taken_mask = 0
+        # The main panel plus the taken ones, the volume panel is added in panel_num
+        self._panel_count = 1
         self._additional_plots = []
 
     @staticmethod
     def __pp_utils_group_ax_by_panel(axes):
-        grouped_axes = dict()
+        # Panels are stacked vertically, the twin axis of a panel shares both of its edges
+        grouped_axes = defaultdict(list)
         for ax in axes:
-            grouped_axes.setdefault(ax.bbox.bounds, [])
-            grouped_axes[ax.bbox.bounds].append(ax)
+            y0, y1 = ax.bbox.intervaly
+            grouped_axes[(round(y0, 3), round(y1, 3))].append(ax)
 
         assert all(map(lambda x: len(x) <= 2, grouped_axes.values()))
 
         return grouped_axes
 
-    def _pp_move_legend_outside(self, fig, axes):
-
-        grouped_axes = self.__pp_utils_group_ax_by_panel(axes)
+    def _pp_move_legend_outside(self, fig, grouped_axes):
 
         for _axes in grouped_axes.values():
             # Only need to merge when both have legend
@@ -105,9 +116,7 @@ class OHLCMpfPlotter:
 
         return
 
-    def _pp_merge_legend_for_each_panel(self, fig, axes):
-
-        grouped_axes = self.__pp_utils_group_ax_by_panel(axes)
+    def _pp_merge_legend_for_each_panel(self, fig, grouped_axes):
 
         for _axes in grouped_axes.values():
             # Only need to merge when both have legend
@@ -127,17 +136,19 @@ class OHLCMpfPlotter:
     def postprocess(self, fig, axes):
         """Add y axis and etc"""
 
+        if not (self.merge_legend_for_each_panel or self.move_legend_outside):
+            return
+
+        grouped_axes = self.__pp_utils_group_ax_by_panel(axes)
         if self.merge_legend_for_each_panel:
-            self._pp_merge_legend_for_each_panel(fig, axes)
+            self._pp_merge_legend_for_each_panel(fig, grouped_axes)
         if self.move_legend_outside:
-            self._pp_move_legend_outside(fig, axes)
+            self._pp_move_legend_outside(fig, grouped_axes)
         return
 
     @property
     def panel_num(self) -> int:
-        ret = 1 + len(self._taken_panel_nums)
-        ret += 1 if self.volume else 0
-        return ret
+        return self._panel_count + self.volume
 
     @property
     def panel_ratios(self):
@@ -146,9 +157,81 @@ class OHLCMpfPlotter:
     @panel_ratios.setter
     def panel_ratios(self, val):
         self._panel_ratios = val
+        self._args_dirty = True
 
     @property
-    def plotter_args(self):
+    def main_panel(self) -> int:
+        return self._main_panel
+
+    @main_panel.setter
+    def main_panel(self, val: int):
+        self._main_panel = val
+        self._args_dirty = True
+
+    @property
+    def volume(self) -> bool:
+        return self._volume
+
+    @volume.setter
+    def volume(self, val: bool):
+        self._volume = val
+        self._args_dirty = True
+
+    @property
+    def volume_panel(self) -> int:
+        return self._volume_panel
+
+    @volume_panel.setter
+    def volume_panel(self, val: int):
+        self._volume_panel = val
+        self._args_dirty = True
+
+    @property
+    def figscale(self):
+        return self._figscale
+
+    @figscale.setter
+    def figscale(self, val):
+        self._figscale = val
+        self._args_dirty = True
+
+    @property
+    def figratio(self):
+        return self._figratio
+
+    @figratio.setter
+    def figratio(self, val):
+        self._figratio = val
+        self._args_dirty = True
+
+    @property
+    def figsize(self):
+        return self._figsize
+
+    @figsize.setter
+    def figsize(self, val):
+        self._figsize = val
+        self._args_dirty = True
+
+    @property
+    def style(self):
+        return self._style
+
+    @style.setter
+    def style(self, val):
+        self._style = val
+        self._args_dirty = True
+
+    @property
+    def figure_title(self):
+        return self._figure_title
+
+    @figure_title.setter
+    def figure_title(self, val):
+        self._figure_title = val
+        self._args_dirty = True
+
+    def _build_plotter_args(self) -> dict:
         ret = {'returnfig': True,
                'volume_panel': self.volume_panel,
                'volume': self.volume,
@@ -157,7 +240,6 @@ class OHLCMpfPlotter:
                }
 
         for _key, _val in [
-                ('addplot', self._additional_plots),
                 ('figsize', self.figsize),
                 ('figscale', self.figscale),
                 ('figratio', self.figratio),
@@ -165,18 +247,32 @@ class OHLCMpfPlotter:
                 ('title', self.figure_title),
         ]:
             if _val is not None:
-                ret[_key] = _val
+                # Copy lists so editing one in place cannot leave the cache stale
+                ret[_key] = tuple(_val) if isinstance(_val, list) else _val
         return ret
 
+    @property
+    def plotter_args(self):
+        if self._args_dirty:
+            self._cached_args = self._build_plotter_args()
+            self._args_dirty = False
+        return {**self._cached_args, 'addplot': self._additional_plots}
+
     def get_new_panel_num(self):
-        for panel in range(0, 33):
-            if panel == self.main_panel or  panel in self._taken_panel_nums:
-                continue
-            if self.volume and panel == self.volume_panel:
-                continue
-            self._taken_panel_nums.append(panel)
-            return panel
-        raise ValueError('The number of panel is 32 at most')
+        taken = self._taken_mask | (1 << self.main_panel)
+        if self.volume:
+            taken |= 1 << self.volume_panel
+
+        # Lowest free panel is the lowest set bit of the complement, panels 0 to 32 as before
+        free = ~taken & self._ALL_PANELS_MASK
+        if not free:
+            raise ValueError('The number of panel is 32 at most')
+
+        panel = (free & -free).bit_length() - 1
+        self._taken_mask |= 1 << panel
+        self._taken_panel_nums.append(panel)
+        self._panel_count += 1
+        return panel
 
     def plot(self, df: pd.DataFrame, **kwargs):
         if self.tick_col in df.columns:
@@ -216,7 +312,7 @@ class OHLCMpfPlotter:
         _plotter_args = self.plotter_args.copy()
         _plotter_args['new_panel_num'] = new_panel_num
 
-        self._additional_plots += indicator.make_addplot(_plotter_args, *args, **kwargs)
+        self._additional_plots.extend(indicator.make_addplot(_plotter_args, *args, **kwargs))
         return self
 
 
@@ -275,25 +371,44 @@ class OHLCMultiFigurePlotter(OHLCMpfPlotter):
         else:
             self.figsize_main = figsize_main
 
-        self.fig_main = plt.figure(figsize=self.figsize_main)
-        self.subfigs = self.fig_main.subfigures(nrows, ncols)
-        if ncols == 1 or nrows == 1:
-            self.current_subifg = self.subfigs[0]
+        # Only a figure that will be shown goes through pyplot, a bare Figure skips the
+        # pyplot bookkeeping and backend setup
+        if noshow:
+            self.fig_main = matplotlib.figure.Figure(figsize=self.figsize_main)
         else:
-            self.current_subifg = self.subfigs[0][0]
+            self.fig_main = plt.figure(figsize=self.figsize_main)
+        # Always a 2-D array, subfigures only lay out the grid, the Axes are made by mpf.plot
+        self.subfigs = self.fig_main.subfigures(nrows, ncols, squeeze=False)
+        self.current_subfig = self.subfigs[0, 0]
+
+    @property
+    def current_subfig(self):
+        return self._current_subfig
+
+    @current_subfig.setter
+    def current_subfig(self, val):
+        self._current_subfig = val
+        self._args_dirty = True
+
+    @property
+    def current_subifg(self):
+        """Read-only alias of current_subfig, kept for callers using the old misspelt name"""
+        return self.current_subfig
         
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.tight_layout:
+            self.fig_main.tight_layout()
+
+        if not self.noshow:
+            plt.show()
+
     def select_subfig(self, subfig_idx: int):
 
-        if self.ncols == 1 or self.nrows == 1:
-            self.current_subifg = self.subfigs[subfig_idx]
-        else:
-            _idx_col = subfig_idx % self.ncols
-            _idx_row = subfig_idx // self.ncols
-            self.current_subifg = self.subfigs[_idx_row][_idx_col]
+        _idx_row, _idx_col = divmod(subfig_idx, self.ncols)
+        self.current_subfig = self.subfigs[_idx_row, _idx_col]
 
     def set_subfig_suptitle(self, title):
-        self.current_subifg.suptitle(title)
+        self.current_subfig.suptitle(title)
 
-    @property
-    def plotter_args(self):
-        return {**super().plotter_args, 'subfig': self.current_subifg}
+    def _build_plotter_args(self) -> dict:
+        return {**super()._build_plotter_args(), 'subfig': self.current_subfig}
@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 import datetime as dt
-from typing import Optional
+from typing import Callable, Optional
 from enum import Enum
 
 from yhfinance.const.db import MetaColName
 from .tasks import BaseTask, DownloadSwitch
 from ..tickers import TickerType, Period, Interval, HistoryExtraOptions
 
+_METAINFO_COLS: tuple[str, ...] = tuple(MetaColName.to_list())
+
+
 @dataclass
 class UserConfig:
     ticker_name: str
@@ -55,12 +58,9 @@ class JobSetup:
         return self.run_datetime.date()
 
     def __post_init__(self):
-        # Only need to check if download history data
-        if self.download_switch & DownloadSwitch.HISTORY:
-            if self.period is None:
-                assert self.end is not None and self.start is not None
-            else:
-                assert self.end is None and self.start is None
+        # Only need to check if download history data, either period alone or start and end
+        if __debug__ and self.download_switch & DownloadSwitch.HISTORY:
+            assert (self.period is None) == (self.start is not None) == (self.end is not None)
     
     def get_history_args(self) -> dict:
 
@@ -91,19 +91,25 @@ class JobSetup:
 
     @property
     def metainfo(self) -> dict:
-        ret = {
-            MetaColName.TICKER_NAME  : self.ticker_name,
-            MetaColName.TICKER_TYPE  : self.ticker_type.value,
-            MetaColName.RUN_DATE     : self.run_date,
-            MetaColName.RUN_DATETIME : self.run_datetime,
-            MetaColName.INTRADAY_VER : self.run_intraday_version,
-            MetaColName.TASK_NAME    : self.task.name
-        }
-
-        assert set(self.get_metainfo_cols()) == set(ret.keys())
-
-        return ret
+        # Keys are the same as get_metainfo_cols()
+        return {col: _METAINFO_FIELDS[col](self) for col in _METAINFO_COLS}
 
     @classmethod
-    def get_metainfo_cols(cls) -> list[str]:
-        return MetaColName.to_list()
+    def get_metainfo_cols(cls) -> tuple[str, ...]:
+        return _METAINFO_COLS
+
+
+_METAINFO_FIELDS: dict[str, Callable[[JobSetup], object]] = {
+    MetaColName.TICKER_NAME  : lambda job: job.ticker_name,
+    MetaColName.TICKER_TYPE  : lambda job: job.ticker_type.value,
+    MetaColName.RUN_DATE     : lambda job: job.run_date,
+    MetaColName.RUN_DATETIME : lambda job: job.run_datetime,
+    MetaColName.INTRADAY_VER : lambda job: job.run_intraday_version,
+    MetaColName.TASK_NAME    : lambda job: job.task.name,
+}
+
+# Fail at import, not at the first dump, when MetaColName and the metainfo keys drift apart
+if set(_METAINFO_FIELDS) != set(_METAINFO_COLS):
+    raise RuntimeError(
+        "JobSetup.metainfo keys do not match MetaColName.to_list(): "
+        f"{sorted(set(_METAINFO_FIELDS) ^ set(_METAINFO_COLS))}")
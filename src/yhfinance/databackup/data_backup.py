@@ -1,4 +1,5 @@
 from collections import Counter
+from typing import Optional
 from tabulate import tabulate
 
 
@@ -15,9 +16,9 @@ logger = MyLogger('main')
 
 class DataBackup:
 
-    def __init__(self, ticker_configs: list[UserConfig]):
-        self.job_generator = JobGenerator(ticker_configs=ticker_configs)
-        self.db = DB()
+    def __init__(self, ticker_configs: list[UserConfig], db_name: Optional[str] = None):
+        self.job_generator = JobGenerator(ticker_configs=ticker_configs, db_name=db_name)
+        self.db = DB(db_name)
 
         logger.debug('Databackup initiated')
 
@@ -62,7 +63,7 @@ class DataBackup:
         
         if status is JobStatus.SUCCESS_PULL:
             try:
-                puller.data.dump()
+                puller.data.dump(self.db)
             # TODO create custom exception for data dumping
             except Exception as e:
                 logger.error("Encounter error in data dumping", exc_info=e)
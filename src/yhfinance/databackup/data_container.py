@@ -1,34 +1,54 @@
 
 import abc
-import datetime as dt
 from typing import Optional
 
 from tabulate import tabulate
+import numpy as np
 import pandas as pd
-import json
-from dataclasses import dataclass
+from dateutil.tz import tzlocal
+from dataclasses import dataclass, field
 
 from yhfinance.const.databackup import JobSetup
 from yhfinance.const.db import TableName
 
 from yhfinance.db_utils import DB
+from yhfinance.db_utils.json_codec import dumps_json, dumps_info_json_zstd
 from yhfinance.logger import MyLogger
 
 logger = MyLogger("datadump")
 
+
+def _is_scalar(val) -> bool:
+    """If val can be stored in a SQLite column as is"""
+    return val is None or isinstance(val, (str, int, float, bool))
+
+
 @dataclass(kw_only=True)
 class BaseData(abc.ABC):
 
-    db = DB()
-    
-    def dump(self, job: JobSetup):
+    # Opened on first use rather than at import, so callers that always pass their own DB
+    # (e.g. the staging DB of a backup worker) never touch the default file
+    _default_db = None
+
+    @staticmethod
+    def get_default_db() -> DB:
+        if BaseData._default_db is None:
+            BaseData._default_db = DB()
+        return BaseData._default_db
+
+    def dump(self, job: JobSetup, db: Optional[DB] = None):
         logger.info('Dumping %s for Ticker %s into database', self.__class__.__name__, job.ticker_name)
 
-        self._dump_to_db(job)
+        self._dump_to_db(job, db or self.get_default_db())
 
-    def _dump_to_db(self, job: JobSetup):
+    def _dump_to_db(self, job: JobSetup, db: DB):
         """Save data to database"""
 
+        db.add_dfs(self.get_df_for_db(job), if_exists='append')
+
+    def get_df_for_db(self, job: JobSetup) -> list[tuple[pd.DataFrame, str]]:
+        """Prepare the list of (DataFrame, table_name) to be dumped to DB"""
+
         self._df_for_db_list: list[tuple[pd.DataFrame, str]] = self._prepare_df_for_db(job)
 
         if not self._df_for_db_list:
@@ -36,8 +56,7 @@ class BaseData(abc.ABC):
         else:
             self._log_before_dump_to_db()
 
-        for _df, _tbl_name in self._df_for_db_list:
-            self.db.add_df(_df, _tbl_name, if_exists='append')
+        return self._df_for_db_list
             
     @abc.abstractmethod
     def _prepare_df_for_db(self, job: JobSetup) -> list[tuple[pd.DataFrame, str]]:
@@ -49,23 +68,19 @@ class BaseData(abc.ABC):
 
     @staticmethod
     def _flatten_df_dict(df_dict: dict[str, pd.DataFrame]) -> pd.DataFrame:
-        df_lst = []
-        for exp_date, _df in df_dict.items():
-            _df = _df.copy()
-            _df['expire'] = pd.to_datetime(exp_date)
-            df_lst.append(_df)
-        return pd.concat(df_lst, ignore_index=True)
+        # The dict keys become the expire level, no need to copy each DataFrame
+        df = pd.concat(df_dict, names=['expire']).reset_index(level='expire')
+        df['expire'] = pd.to_datetime(df['expire'])
+        return df.reset_index(drop=True)
 
     @staticmethod
     def _add_job_metainfo_cols(df, job, metainfo_cols=None):
 
-        cols = metainfo_cols or job.metainfo.keys()
+        metainfo = job.metainfo
+        cols = metainfo_cols or metainfo.keys()
 
-        for col in cols:
-            if col not in df.columns:
-                df[col] = job.metainfo[col]
-
-        return df
+        # Add all the missing columns in one go instead of one __setitem__ per column
+        return df.assign(**{col: metainfo[col] for col in cols if col not in df.columns})
 
 
 @dataclass(kw_only=True)
@@ -81,16 +96,12 @@ class OptionData(BaseData):
         if self.expirations:
 
             df_expirations = pd.DataFrame.from_dict({
-                'expire': list(map(pd.to_datetime, self.expirations))
+                'expire': pd.to_datetime(list(self.expirations))
             })
             df_calls = self._flatten_df_dict(self.calls)
             df_puts = self._flatten_df_dict(self.puts)
 
-            _data_dict = {'expire': [], 'underlying_json': []}
-            for exp, _dict in self.underlying.items():
-                _data_dict['expire'].append(pd.to_datetime(exp))
-                _data_dict['underlying_json'].append(json.dumps(_dict))
-            df_underlyings = pd.DataFrame.from_dict(_data_dict)
+            df_underlyings = self._flatten_underlyings()
 
             ret = [
                     (df_expirations, TableName.Option.EXPIRATIONS),
@@ -103,42 +114,69 @@ class OptionData(BaseData):
         else:
             return []
 
-   
-class News:
-
-    def __init__(self, news_dict):
-        self.news_dict = news_dict
-        self.half_text = ""
-        self.full_text = ""
-
-    @property
-    def title(self) -> str:
-        return self.news_dict.get('title', "")
-        
-    @property
-    def type(self) -> str:
-        return self.news_dict.get('type', "").upper()
-
-    @property
-    def link(self) -> str:
-        return self.news_dict.get('link', "")
-    
-    @property
-    def publisher(self) -> str:
-        return self.news_dict.get('publisher', "")
+    # Quote fields of the underlying stored as their own columns, the rest of the dict goes
+    # into extras_json so new keys from yfinance do not change the table schema
+    _UNDERLYING_COLS: tuple[str, ...] = (
+        'symbol', 'currency', 'marketState', 'regularMarketTime',
+        'regularMarketPrice', 'regularMarketChange', 'regularMarketChangePercent',
+        'regularMarketOpen', 'regularMarketDayHigh', 'regularMarketDayLow',
+        'regularMarketPreviousClose', 'regularMarketVolume',
+        'bid', 'ask', 'bidSize', 'askSize',
+        'preMarketPrice', 'postMarketPrice', 'marketCap',
+    )
+
+    def _flatten_underlyings(self) -> pd.DataFrame:
+        """Store the fields in _UNDERLYING_COLS of each underlying dict as columns and the
+        remaining fields as JSON in extras_json. Rows written before this only have the
+        whole dict in underlying_json, the loader reads both
+        """
+        underlyings = list(self.underlying.values())
+
+        data_dict = {'expire': pd.to_datetime(list(self.underlying.keys()))}
+        for k in self._UNDERLYING_COLS:
+            data_dict[k] = [
+                v if _is_scalar(v) else None
+                for v in (_dict.get(k) for _dict in underlyings)
+            ]
 
-    @property
-    def uuid(self) -> str:
-        return self.news_dict.get('uuid', "")
+        # Declared fields holding a nested value fall back to extras_json as well
+        data_dict['extras_json'] = [
+            dumps_json({k: v for k, v in _dict.items()
+                        if k not in self._UNDERLYING_COLS or not _is_scalar(v)})
+            for _dict in underlyings
+        ]
 
-    @property
-    def provider_publish_time(self) -> dt.datetime:
-        return dt.datetime.fromtimestamp(
-            int(self.news_dict.get('providerPublishTime', '0')))
+        return pd.DataFrame.from_dict(data_dict)
 
-    @property
-    def related_tickers(self) -> list[str]:
-        return self.news_dict.get('relatedTickers', [])
+   
+@dataclass(slots=True)
+class News:
+    """Fields are parsed once from the news dict returned by yfinance"""
+
+    uuid: str
+    link: str
+    type: str
+    title: str
+    publisher: str
+    provider_publish_time: int  # Unix timestamp in seconds
+    related_tickers: list[str]
+
+    news_dict: dict = field(default_factory=dict, repr=False)
+    half_text: str = ""
+    full_text: str = ""
+
+    @classmethod
+    def from_dict(cls, news_dict: dict) -> 'News':
+        return cls(
+            uuid=news_dict.get('uuid', ""),
+            link=news_dict.get('link', ""),
+            type=news_dict.get('type', "").upper(),
+            title=news_dict.get('title', ""),
+            publisher=news_dict.get('publisher', ""),
+            provider_publish_time=int(news_dict.get('providerPublishTime', '0')),
+            related_tickers=news_dict.get('relatedTickers', []),
+            news_dict=news_dict
+        )
 
 
 @dataclass
@@ -148,35 +186,20 @@ class NewsData(BaseData):
 
     def _prepare_df_for_db(self, job: JobSetup) -> list[tuple[pd.DataFrame, str]]:
 
-        # TODO - some optimizations are possible here
-        data_dict = {
-            'uuid': [],
-            'link': [],
-            'type': [],
-            'title': [],
-            'publisher': [],
-            'publish_time': [],
-        }
-
-        relation_dict = {
-            'uuid': [],
-            'ticker': []
-        }
-
-        for news in self.news_list:
-            data_dict['uuid'].append(news.uuid)
-            data_dict['link'].append(news.link)
-            data_dict['type'].append(news.type)
-            data_dict['title'].append(news.title)
-            data_dict['publisher'].append(news.publisher)
-            data_dict['publish_time'].append(news.provider_publish_time)
-
-            for ticker in news.related_tickers:
-                relation_dict['uuid'].append(news.uuid)
-                relation_dict['ticker'].append(ticker)
-
-        df_news = pd.DataFrame.from_dict(data_dict)
-        df_relation = pd.DataFrame.from_dict(relation_dict)
+        rows = [
+            (news.uuid, news.link, news.type, news.title, news.publisher, news.provider_publish_time)
+            for news in self.news_list
+        ]
+        df_news = pd.DataFrame.from_records(
+            rows, columns=['uuid', 'link', 'type', 'title', 'publisher', 'publish_time'])
+        # Same as dt.datetime.fromtimestamp, i.e. naive local time, but in one vectorized call
+        df_news['publish_time'] = (
+            pd.to_datetime(df_news['publish_time'], unit='s', utc=True)
+            .dt.tz_convert(tzlocal()).dt.tz_localize(None))
+
+        df_relation = pd.DataFrame.from_records(
+            [(news.uuid, ticker) for news in self.news_list for ticker in news.related_tickers],
+            columns=['uuid', 'ticker'])
 
         ret = [
             (df_news, TableName.News.CONTENT),
@@ -204,12 +227,12 @@ class HistoryData(BaseData):
             logger.debug("Found empty history DataFrame, skip post-processing")
         else:
             # Add special treatment to the raw data
-            _df_history = self.history_raw.reset_index().copy()
+            _df_history = self.history_raw.reset_index()
             if 'Date' in _df_history.columns:  # the index is Date for day history and Datetime for intraday
                 _df_history.rename(columns={'Date': 'Datetime'}, inplace=True)
 
             # NOTE - or use .normalize() but may be better to just keep the date() 
-            _df_history['Date'] = _df_history['Datetime'].apply(lambda x: x.date())
+            _df_history['Date'] = _df_history['Datetime'].dt.date
 
             _interval = self.args['interval']
             _is_intraday = _interval[-1] in {'m', 'h'}
@@ -220,12 +243,11 @@ class HistoryData(BaseData):
 
             # don't save action for intraday history
             if _is_intraday:
-                _cols = [x for x in _df_history.columns
-                        if x.upper() not in {"DIVIDENDS", "STOCK SPLITS", "CAPITAL GAINS"}]
-            else:
-                _cols = _df_history.columns
+                _drop_cols = [x for x in _df_history.columns
+                              if x.upper() in {"DIVIDENDS", "STOCK SPLITS", "CAPITAL GAINS"}]
+                _df_history = _df_history.drop(columns=_drop_cols)
 
-            self.history = _df_history[_cols].copy()
+            self.history = _df_history
 
     def _apply_trading_period_type(self, df, is_intraday: bool,
                                    use_metadata: bool = True
@@ -273,8 +295,11 @@ class HistoryData(BaseData):
                          ', '.join(df_meta.columns))
 
         df = df.merge(df_meta[['tmp_key', 'start', 'end']], on='tmp_key')
-        df.loc[df['Datetime'] < df['start'] , 'period_type'] = 'pre'
-        df.loc[df['Datetime'] >= df['end'] , 'period_type'] = 'post'
+        # Bucket all rows in one pass: 0 -> pre, 1 -> regular, 2 -> post. Comparisons with a
+        # NaT boundary are False, so such rows stay regular unless the other boundary applies
+        _bucket = 1 - (df['Datetime'] < df['start']).to_numpy(dtype=np.int8)
+        _bucket[(df['Datetime'] >= df['end']).to_numpy()] = 2
+        df['period_type'] = np.array(['pre', 'regular', 'post'])[_bucket]
 
         df = df.drop(columns=['tmp_key', 'start', 'end'])
 
@@ -290,19 +315,16 @@ class HistoryData(BaseData):
                         ', '.join(map(str, _unique_dates)))
             return df
 
-        # Below is from yfinance.util
+        # Below is from yfinance.util, all the boundaries are converted in one call
         tz = self.metadata["exchangeTimezoneName"]
-        _parsed_md = {}
-        for m in ["regular", "pre", "post"]:
-            if (m in self.metadata["currentTradingPeriod"]
-                and isinstance(self.metadata["currentTradingPeriod"][m]["start"], int)
-                ):
-                _parsed_md[m] = {}
-                for t in ["start", "end"]:
-                    _parsed_md[m][t] = pd.to_datetime(
-                        self.metadata["currentTradingPeriod"][m][t],
-                        unit='s',
-                        utc=True).tz_convert(tz)
+        _ctp = self.metadata["currentTradingPeriod"]
+        _periods = [m for m in ["regular", "pre", "post"]
+                    if m in _ctp and isinstance(_ctp[m]["start"], int)]
+        _ts = pd.to_datetime(
+            [_ctp[m][t] for m in _periods for t in ["start", "end"]],
+            unit='s', utc=True).tz_convert(tz)
+        _parsed_md = {m: {'start': _ts[2 * i], 'end': _ts[2 * i + 1]}
+                      for i, m in enumerate(_periods)}
 
         if 'regular' in _parsed_md:
             _start = _parsed_md['regular']['start']
@@ -310,8 +332,9 @@ class HistoryData(BaseData):
 
             logger.debug('Found trading period as [%s, %s)', _start, _end)
 
-            df.loc[df['Datetime'] < _start, 'period_type'] = 'pre'
-            df.loc[df['Datetime'] >= _end, 'period_type'] = 'post'
+            # Bucket all rows in one pass: [.., start) -> pre, [start, end) -> regular, [end, ..) -> post
+            _bucket = pd.DatetimeIndex([_start, _end]).searchsorted(df['Datetime'], side='right')
+            df['period_type'] = np.array(['pre', 'regular', 'post'])[_bucket]
 
         else:
             logger.warn('No regular defined in currentTradingPeriod, skip parsing')
@@ -330,7 +353,7 @@ class HistoryData(BaseData):
 
         # Only select OLHC data for intraday history
         _interval = self.args['interval']
-        _df_args = pd.DataFrame.from_dict({k: [v] for k,v in self.args.items()})
+        _df_args = pd.DataFrame([self.args])
 
         # Special Treatment for history_metadata
         # Some fields does not fit the table:
@@ -350,8 +373,8 @@ class HistoryData(BaseData):
                     for _k3, _v3 in _dct.items():
                         _meta_dict['-'.join(['ctp', _k2, _k3])] = _v3
             else:
-                _meta_dict[k] = [v]
-        _df_meta = pd.DataFrame.from_dict(_meta_dict)
+                _meta_dict[k] = v
+        _df_meta = pd.DataFrame([_meta_dict])
 
         ret = [
             (self.history, TableName.History.PRICE_TABLE_MAPPING[_interval]),
@@ -391,9 +414,8 @@ class InfoData(BaseData):
 
     def _prepare_df_for_db(self, job: JobSetup):
 
-        _df = pd.DataFrame.from_dict({
-            'info_json': [json.dumps(self.info)]
-        })
+        # The info dict has hundreds of keys, store it zstd compressed
+        _df = pd.DataFrame({'info_json_zstd': [dumps_info_json_zstd(self.info)]})
         return [(self._add_job_metainfo_cols(_df, job), TableName.Info)]
 
 
@@ -425,7 +447,7 @@ class FinancialData(BaseData):
         ret = []
         for df, tbl_name in tmp_lst:
             if df is not None and not df.empty:
-                _df = df.transpose().reset_index(names='report_date')
+                _df = df.rename_axis('report_date', axis=1).T.reset_index()
                 ret.append(
                     (self._add_job_metainfo_cols(_df, job), tbl_name)
                 )
@@ -483,8 +505,18 @@ class DataContainer:
     rating: Optional[RatingData] = None
     option: Optional[OptionData] = None
 
-    def dump(self):
+    def dump(self, db: Optional[DB] = None):
+        """Dump all the data in one go, DataFrames for the same table are written together
+
+        A data object failing to prepare its DataFrames is logged and skipped, the others
+        are still written. The failure is raised afterwards so the job is not marked as a
+        success
+        """
+
+        db = db or BaseData.get_default_db()
 
+        df_for_db_list: list[tuple[pd.DataFrame, str]] = []
+        failed: list[tuple[str, Exception]] = []
         for data in [self.history,
                       self.info,
                       self.news,
@@ -493,4 +525,20 @@ class DataContainer:
                       self.rating,
                       self.option]:
             if data is not None:
-                data.dump(self.job)
+                _data_name = data.__class__.__name__
+                logger.info('Dumping %s for Ticker %s into database',
+                            _data_name, self.job.ticker_name)
+                try:
+                    df_for_db_list += data.get_df_for_db(self.job)
+                except Exception as e:
+                    logger.error('Failed to prepare %s for Ticker %s, skipped',
+                                 _data_name, self.job.ticker_name, exc_info=e)
+                    failed.append((_data_name, e))
+
+        with db.bulk_load():
+            db.add_dfs(df_for_db_list, if_exists='append')
+
+        if failed:
+            raise RuntimeError(
+                f"Failed to dump {', '.join(name for name, _ in failed)}"
+                f" for Ticker {self.job.ticker_name}") from failed[0][1]
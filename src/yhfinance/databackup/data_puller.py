@@ -180,7 +180,7 @@ class TickerPuller(abc.ABC):
     def _download_news(self):
 
         self._news = NewsData(
-            news_list=[News(news_dict) for news_dict in self.ticker.news])
+            news_list=[News.from_dict(news_dict) for news_dict in self.ticker.news])
 
         if self.job.download_full_text_news:
             print("Warning: full text fetching has not been implemented")
@@ -2,7 +2,6 @@
 """
 
 import datetime as dt
-import pandas as pd
 
 from typing import Optional
 
@@ -19,12 +18,47 @@ logger = MyLogger("job-gen")
 
 class JobGenerator:
 
-    def __init__(self, ticker_configs: list[UserConfig]):
+    def __init__(self, ticker_configs: list[UserConfig], db_name: Optional[str] = None):
         self._jobs: list[JobSetup] = []
         self.ticker_configs: list[UserConfig] = ticker_configs
         self.run_datetime = dt.datetime.today()
-        self.fetcher = DBFetcher()
+        self.fetcher = DBFetcher(db_name)
         self._created: bool = False
+
+        # Keyed by (task_name, ticker_name, ticker_type), loaded from run_log in create_jobs
+        self._last_run_cache: dict[tuple[str, str, str], dt.datetime] = {}
+        self._today_count_cache: dict[tuple[str, str, str], int] = {}
+
+    def _load_run_log_cache(self):
+        """Load the last successful run time and today's successful run count of every
+        (task, ticker) in two queries, instead of querying run_log for each task"""
+
+        df_last_run = self.fetcher.read_sql_params(f"""
+        SELECT task_name, ticker_name, ticker_type, MAX(run_datetime)
+        FROM [{TableName.Meta.run_log}]
+        WHERE run_status = ?
+        GROUP BY 1, 2, 3
+        """, (JobStatus.SUCCESS.value, ))
+        # run_datetime is stored by to_sql as 'YYYY-MM-DD HH:MM:SS[.ffffff]'
+        self._last_run_cache = {
+            (task_name, ticker_name, ticker_type): dt.datetime.fromisoformat(str(last_run))
+            for task_name, ticker_name, ticker_type, last_run
+            in df_last_run.itertuples(index=False, name=None)
+            if last_run is not None
+        }
+
+        df_today_count = self.fetcher.read_sql_params(f"""
+        SELECT task_name, ticker_name, ticker_type, COUNT(1)
+        FROM [{TableName.Meta.run_log}]
+        WHERE run_status = ?
+            AND run_date = ?
+        GROUP BY 1, 2, 3
+        """, (JobStatus.SUCCESS.value, str(self.run_datetime.date())))
+        self._today_count_cache = {
+            (task_name, ticker_name, ticker_type): cnt
+            for task_name, ticker_name, ticker_type, cnt
+            in df_today_count.itertuples(index=False, name=None)
+        }
   
     def _gen_job(
             self, ticker_name: str, ticker_type: TickerType,
@@ -32,20 +66,8 @@ class JobGenerator:
     ) -> JobSetup:
         """Generate the job spec for the given task"""
 
-        sql = f"""
-        SELECT COUNT(1) AS cnt
-        FROM [{TableName.Meta.run_log}]
-        WHERE task_name = '{task.name}'
-            AND run_status = {JobStatus.SUCCESS.value}
-            AND run_date = '{self.run_datetime.date()}'
-            AND ticker_name = '{ticker_name}'
-            AND ticker_type = '{ticker_type.value}'
-        """
-        df = self.fetcher.read_sql(sql)
-
-        if df.empty:  intraday_ver = 1
-        else:
-            intraday_ver = df.iloc[0, 0] + 1
+        intraday_ver = self._today_count_cache.get(
+            (task.name, ticker_name, ticker_type.value), 0) + 1
 
         args = {
             'ticker_name'  : ticker_name,
@@ -56,9 +78,7 @@ class JobGenerator:
             **task.get_args(self.run_datetime),
         }
 
-        job = JobSetup(**args)
-        self.fetcher.db.add_job_status(job, JobStatus.INIT.value)
-        return job
+        return JobSetup(**args)
 
     def _has_enough_gap_since_last_run(
             self,
@@ -66,21 +86,13 @@ class JobGenerator:
             task: BaseTask, buffer_time: dt.timedelta = dt.timedelta(minutes=20)
     ) -> bool:
 
-        df = self.fetcher.read_sql(f"""
-        SELECT MAX(run_datetime)
-        FROM [{TableName.Meta.run_log}]
-        WHERE task_name = '{task.name}'
-            AND ticker_name = '{ticker_name}'
-            AND ticker_type = '{ticker_type.value}'
-            AND run_status = {JobStatus.SUCCESS.value}
-        """)
+        last_run_time = self._last_run_cache.get((task.name, ticker_name, ticker_type.value))
 
         ret = False
-        if df.empty or df.iloc[0, 0] is None:
+        if last_run_time is None:
             logger.debug("There is no successful runs in the log for task %s", task.name)
             ret = True
         else:
-            last_run_time = pd.to_datetime(df.iloc[0, 0])
             if ((self.run_datetime - last_run_time)
                 > (task.backup_freq.value - buffer_time)):
                 logger.debug("Last run is outside wait window for task %s: %s - %s > %s with buffer %s",
@@ -112,10 +124,9 @@ class JobGenerator:
             logger.info('Task %s is AD_HOC task, always added', task.name)
             return True
 
-        satisfy_backup_freq = self._has_enough_gap_since_last_run(ticker_name, ticker_type, task)
-        satisfy_conditions = self._check_backup_conditions(task)
-
-        ret = all([satisfy_backup_freq, *satisfy_conditions])
+        # The conditions are only checked once the frequency gate passes
+        ret = (self._has_enough_gap_since_last_run(ticker_name, ticker_type, task)
+               and all(self._check_backup_conditions(task)))
         if not ret:
             logger.info("Task %s will NOT be added", task.name)
         else:
@@ -125,6 +136,9 @@ class JobGenerator:
 
     def create_jobs(self) -> list[JobSetup]:
 
+        self._load_run_log_cache()
+        _n_existing_jobs = len(self._jobs)
+
         for ticker_config in self.ticker_configs:
             logger.debug("Found %d tasks defined for Ticker %s (%s)",
                          len(ticker_config.tasks), ticker_config.ticker_name, ticker_config.ticker_type.value)
@@ -140,6 +154,9 @@ class JobGenerator:
 
         logger.info("Generated %d jobs in total for %d Tickers", len(self._jobs), len(self.ticker_configs))
 
+        # All the INIT status go in one transaction rather than a commit per job
+        self.fetcher.db.add_job_statuses(self._jobs[_n_existing_jobs:], JobStatus.INIT.value)
+
         self._created = True
 
         return self._jobs
@@ -15,6 +15,7 @@ from yhfinance.const.db.col_name import MetaColName
 from yhfinance.utils import parse_input_datetime
 from yhfinance.const.tickers import Interval
 from yhfinance.db_utils import DBConfig, DBFetcher
+from yhfinance.db_utils.json_codec import loads_info_json, loads_json
 
 TimeInput = Union[int , str , dt.datetime , dt.date , pd.Timestamp]
 
@@ -24,9 +25,10 @@ class BaseLoader(abc.ABC):
     
     def __init__(self,
                  ticker_name: str,
-                 db_name: str = DBConfig.DB_NAME,
+                 db_name: Optional[str] = None,
                  ):
         self.ticker_name: str = ticker_name
+        db_name = DBConfig.DB_NAME if db_name is None else db_name
         self._db_name = db_name
 
         if BaseLoader._fetcher_regs.get(db_name) is None:
@@ -238,12 +240,107 @@ class PutOptionLoader(_OptionLoader):
         return TableName.Option.PUTS
 
 
+class InfoLoader(BaseLoader):
+
+    @property
+    def _tbl_name(self) -> str:
+        return TableName.Info
+
+    def _build_extra_conds(self) -> str:
+        return ""
+
+    def load(self, *,
+             run_start: Optional[TimeInput] = None,
+             run_end: Optional[TimeInput] = None,
+             ignore_ticker_name_case: bool = True,
+             ignore_meta_column: bool | list[str] = [
+                 MetaColName.RUN_DATE, MetaColName.TASK_NAME]
+             ) -> pd.DataFrame:
+        """Load the saved info, one row per run with the decoded dict in the info column"""
+
+        self._ignore_ticker_name_case = ignore_ticker_name_case
+        self._run_start = run_start
+        self._run_end = run_end
+
+        df = self.fetcher.read_sql(self._build_query())
+
+        # Older rows only have info_json, newer ones only info_json_zstd, info is None when
+        # a row has neither
+        _raw_cols = [col for col in ('info_json', 'info_json_zstd') if col in df.columns]
+        df['info'] = [
+            loads_info_json(**{col: val for col, val in zip(_raw_cols, vals) if pd.notna(val)})
+            for vals in df[_raw_cols].itertuples(index=False, name=None)
+        ]
+        df = df.drop(columns=_raw_cols)
+
+        if ignore_meta_column:
+            df = self._filter_meta_column(df, ignore_meta_column)
+
+        return df
+
+
+class OptionUnderlyingLoader(BaseLoader):
+
+    _RAW_COLS: tuple[str, ...] = ('underlying_json', 'extras_json')
+
+    @property
+    def _tbl_name(self) -> str:
+        return TableName.Option.UNDERLYINGS
+
+    def _build_extra_conds(self) -> str:
+        return ""
+
+    def load(self, *,
+             run_start: Optional[TimeInput] = None,
+             run_end: Optional[TimeInput] = None,
+             ignore_ticker_name_case: bool = True,
+             ignore_meta_column: bool | list[str] = [
+                 MetaColName.RUN_DATE, MetaColName.TASK_NAME]
+             ) -> pd.DataFrame:
+        """Load the saved option underlyings, one row per run and expire with the decoded
+        dict in the underlying column"""
+
+        self._ignore_ticker_name_case = ignore_ticker_name_case
+        self._run_start = run_start
+        self._run_end = run_end
+
+        df = self.fetcher.read_sql(self._build_query())
+
+        # Older rows only have underlying_json, newer ones keep the declared fields as
+        # columns and everything else in extras_json
+        _raw_cols = [col for col in self._RAW_COLS if col in df.columns]
+        _excluded_cols = set(MetaColName.to_list()) | set(self._RAW_COLS) | {'expire'}
+        _field_cols = [col for col in df.columns if col not in _excluded_cols]
+        df['underlying'] = [
+            self._parse_row(dict(zip(_raw_cols, raw_vals)), dict(zip(_field_cols, field_vals)))
+            for raw_vals, field_vals in zip(
+                    df[_raw_cols].itertuples(index=False, name=None),
+                    df[_field_cols].itertuples(index=False, name=None))
+        ]
+        df = df.drop(columns=_raw_cols + _field_cols)
+
+        if ignore_meta_column:
+            df = self._filter_meta_column(df, ignore_meta_column)
+
+        return df
+
+    @staticmethod
+    def _parse_row(raw: dict, fields: dict) -> dict:
+        if pd.notna(raw.get('underlying_json')):
+            return loads_json(raw['underlying_json'])
+
+        ret = {k: v for k, v in fields.items() if pd.notna(v)}
+        if pd.notna(raw.get('extras_json')):
+            ret.update(loads_json(raw['extras_json']))
+        return ret
+
+
 class _HistoryLoader(BaseLoader):
 
     def __init__(self,
                  ticker_name: str,
                  interval: Interval | str,
-                 db_name: str = DBConfig.DB_NAME):
+                 db_name: Optional[str] = None):
         super().__init__(ticker_name, db_name)
 
         if isinstance(interval, str):
@@ -326,15 +423,17 @@ class DayHistoryLoader(_HistoryLoader):
 
 class DBLoader:
 
-    def __init__(self, ticker_name: str, db_name: str = DBConfig.DB_NAME):
+    def __init__(self, ticker_name: str, db_name: Optional[str] = None):
         self.ticker_name = ticker_name
-        self._db_name = db_name
+        self._db_name = DBConfig.DB_NAME if db_name is None else db_name
 
         self._call_option_loader: Optional[CallOptionLoader] = None
         self._put_option_loader: Optional[CallOptionLoader] = None
         # self._option_expirations_loader: Optional[CallOptionLoader] = None
 
         self._hist_loaders: dict[str, IntradayHistoryLoader | DayHistoryLoader] = {}
+        self._info_loader: Optional[InfoLoader] = None
+        self._option_underlying_loader: Optional[OptionUnderlyingLoader] = None
 
     def get_options(
             self,
@@ -403,3 +502,35 @@ class DBLoader:
 
         return self._hist_loaders[_interval.value].load(**args)
         
+
+    def get_info(
+            self,
+            run_start: Optional[TimeInput] = None,
+            run_end: Optional[TimeInput] = None,
+            ignore_ticker_name_case: bool = True,
+            ignore_meta_column: bool | list[str] = [MetaColName.RUN_DATE, MetaColName.TASK_NAME]
+    ) -> pd.DataFrame:
+
+        if self._info_loader is None:
+            self._info_loader = InfoLoader(self.ticker_name, self._db_name)
+
+        return self._info_loader.load(
+            run_start=run_start, run_end=run_end,
+            ignore_ticker_name_case=ignore_ticker_name_case,
+            ignore_meta_column=ignore_meta_column)
+
+    def get_option_underlyings(
+            self,
+            run_start: Optional[TimeInput] = None,
+            run_end: Optional[TimeInput] = None,
+            ignore_ticker_name_case: bool = True,
+            ignore_meta_column: bool | list[str] = [MetaColName.RUN_DATE, MetaColName.TASK_NAME]
+    ) -> pd.DataFrame:
+
+        if self._option_underlying_loader is None:
+            self._option_underlying_loader = OptionUnderlyingLoader(self.ticker_name, self._db_name)
+
+        return self._option_underlying_loader.load(
+            run_start=run_start, run_end=run_end,
+            ignore_ticker_name_case=ignore_ticker_name_case,
+            ignore_meta_column=ignore_meta_column)
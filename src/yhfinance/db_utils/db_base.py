@@ -1,7 +1,10 @@
 
+import math
 import sqlite3
+import datetime as dt
+from contextlib import contextmanager
 
-from typing import Literal 
+from typing import Literal, Optional
 
 import pandas as pd
 
@@ -17,10 +20,18 @@ logger = MyLogger(DBConfig.LOGGER_NAME)
 class DB:
 
     _conn_dict: dict[str, sqlite3.Connection] = {}
+    # The connection the meta table of each DB was checked on, so extra DB instances on the
+    # same connection stay cheap. A new connection to the same file is checked again
+    _meta_checked_conns: dict[str, sqlite3.Connection] = {}
+
+    # Max number of host parameters in a single statement, raised from 999 in SQLite 3.32
+    _max_variable_number: int = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    # Frames up to this size are appended to an existing table via executemany, skipping to_sql
+    _raw_insert_max_rows: int = 16
 
     # TODO - make this one a module level configurable variable
-    def __init__(self, db_name: str = DBConfig.DB_NAME):
-        self._db_name = db_name
+    def __init__(self, db_name: Optional[str] = None):
+        self._db_name = DBConfig.DB_NAME if db_name is None else db_name
 
         self._on_init_check_meta_table()
 
@@ -30,6 +41,23 @@ class DB:
             self._conn_dict[self._db_name] = sqlite3.connect(self._db_name)
         return self._conn_dict[self._db_name]
 
+    @contextmanager
+    def bulk_load(self):
+        """Relax the durability of the connection for a bulk dump, i.e. no fsync on each
+        commit and temp storage in memory. The original settings are restored on exit
+        """
+        conn = self.conn
+        _synchronous = conn.execute('PRAGMA synchronous').fetchone()[0]
+        _temp_store = conn.execute('PRAGMA temp_store').fetchone()[0]
+
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        try:
+            yield conn
+        finally:
+            conn.execute(f'PRAGMA synchronous = {_synchronous}')
+            conn.execute(f'PRAGMA temp_store = {_temp_store}')
+
     def _exist_table(self, tbl_name):
         with self.conn as conn:
             cur = conn.cursor()
@@ -37,19 +65,69 @@ class DB:
             ret = res.fetchone() is not None
         return ret
     
+    def _to_sql(self, df: pd.DataFrame, table_name: str,
+                if_exists: Literal['append', 'fail', 'replace']):
+        """Insert with multi-row VALUES statements, each chunk stays within the
+        host parameter limit of SQLite"""
+        chunksize = max(1, self._max_variable_number // max(1, len(df.columns)))
+        with self.conn as conn:
+            df.to_sql(table_name, conn, if_exists=if_exists, index=False,
+                      method='multi', chunksize=chunksize)
+
+    @staticmethod
+    def _to_sql_value(val):
+        """Convert a DataFrame cell to the value to_sql would bind for SQLite"""
+        if isinstance(val, pd.Timestamp):
+            val = val.to_pydatetime()
+        elif hasattr(val, 'item') and not isinstance(val, (str, bytes)):
+            val = val.item()  # numpy scalar
+
+        if val is None or val is pd.NaT or val is pd.NA:
+            return None
+        if isinstance(val, float) and math.isnan(val):
+            return None
+        if isinstance(val, dt.datetime):
+            return val.isoformat(' ')
+        if isinstance(val, (dt.date, dt.time)):
+            return val.isoformat()
+        return val
+
+    def _insert_rows(self, df: pd.DataFrame, table_name: str):
+        """Append the rows of a small DataFrame to an existing table with a plain executemany"""
+        cols = ', '.join(f'"{col}"' for col in df.columns)
+        placeholders = ', '.join('?' * len(df.columns))
+        rows = [tuple(map(self._to_sql_value, row))
+                for row in df.itertuples(index=False, name=None)]
+
+        with self.conn as conn:
+            conn.executemany(f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders})', rows)
+
     def _on_init_check_meta_table(self):
         """Check if the basic meta table is correctly setup in DB"""
 
+        if self._meta_checked_conns.get(self._db_name) is self.conn:
+            return
+
         if not self._exist_table(TableName.Meta.run_log):
             with self.conn as conn:
                 logger.debug('MetaTable %s does not exist, creating a new one', TableName.Meta.run_log)
                 conn.execute(MetaTableDefinition.run_log)
 
+        self._meta_checked_conns[self._db_name] = self.conn
+
+    def reset_meta_table_check(self):
+        """Forget that the meta table was checked, call it after dropping the meta table"""
+        self._meta_checked_conns.pop(self._db_name, None)
+
     def add_job_status(self, job: JobSetup, status: int):
-        _df = pd.DataFrame.from_dict({
-            'run_status': [status],
-            **{k: [v] for k, v in job.metainfo.items()}
-        })
+        self.add_job_statuses([job], status)
+
+    def add_job_statuses(self, jobs: list[JobSetup], status: int):
+        """Log the same status for all the jobs in one insert and one commit"""
+        if not jobs:
+            return
+
+        _df = pd.DataFrame([{'run_status': status, **job.metainfo} for job in jobs])
 
         with self.conn as conn:
             _df.to_sql(TableName.Meta.run_log, conn, if_exists='append', index=False)
@@ -63,20 +141,37 @@ class DB:
 
         if if_exists == 'append':
 
-            if self._exist_table(table_name):
+            _exist_table = self._exist_table(table_name)
+            if _exist_table:
                self._reconcile_df_column_names(df, table_name)
 
             try:
-                with self.conn as conn:
-                    df.to_sql(table_name, conn, if_exists=if_exists, index=False)
+                if (_exist_table and len(df.index) <= self._raw_insert_max_rows
+                    and 'm' not in {dtype.kind for dtype in df.dtypes}):
+                    self._insert_rows(df, table_name)
+                else:
+                    self._to_sql(df, table_name, if_exists)
             except Exception as e:
                 logger.error('Encountered error when dumping DataFrame to %s', table_name, exc_info=e)
             else:
                 logger.info('Successfully dump DataFrame [size: %s] into %s', str(df.shape), table_name)
         else:
-            with self.conn as conn:
-                df.to_sql(table_name, conn, if_exists=if_exists, index=False)
+            self._to_sql(df, table_name, if_exists)
+
+
+    def add_dfs(self,
+                df_list: list[tuple[pd.DataFrame, str]],
+                if_exists: Literal['append', 'fail', 'replace'] = 'append'):
+        """Dump a list of (DataFrame, table_name), DataFrames for the same table are
+        concatenated first so that each table only needs one to_sql call"""
+
+        grouped_dfs: dict[str, list[pd.DataFrame]] = {}
+        for df, table_name in df_list:
+            grouped_dfs.setdefault(table_name, []).append(df)
 
+        for table_name, dfs in grouped_dfs.items():
+            df = dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
+            self.add_df(df, table_name, if_exists=if_exists)
 
     def _reconcile_df_column_names(self, df: pd.DataFrame, table_name: str):
 
@@ -97,6 +192,8 @@ class DB:
                     _type = 'INTEGER'
                 elif 'datetime' in _type_name:
                     _type = 'TIMESTAMP'
+                elif len(df.index) > 0 and isinstance(df[col].iloc[0], bytes):
+                    _type = 'BLOB'
                 else:
                     _type = 'TEXT'
                 new_cols.append((col, _type))
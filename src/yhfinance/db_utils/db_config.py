@@ -1,9 +1,27 @@
 
+import os
 from pathlib import Path
+from typing import Optional
 
-class DBConfig:
 
-    DB_NAME: str = (Path.home() / 'Dropbox' / '66-DBs' / 'FinDB.db').absolute().as_posix()
+class _DBConfigMeta(type):
+
+    @property
+    def DB_NAME(cls) -> str:
+        """Resolved on first access, the YHFIN_DB environment variable overrides the
+        default location"""
+        if cls._db_name is None:
+            cls._db_name = os.environ.get('YHFIN_DB') or (
+                Path.home() / 'Dropbox' / '66-DBs' / 'FinDB.db').absolute().as_posix()
+        return cls._db_name
+
+    @DB_NAME.setter
+    def DB_NAME(cls, val: str):
+        cls._db_name = val
 
-    LOGGER_NAME = 'db-utils'
 
+class DBConfig(metaclass=_DBConfigMeta):
+
+    _db_name: Optional[str] = None
+
+    LOGGER_NAME = 'db-utils'
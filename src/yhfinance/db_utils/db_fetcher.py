@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pandas as pd
 
 from yhfinance.const.db import TableName
@@ -10,7 +12,8 @@ logger = MyLogger(DBConfig.LOGGER_NAME)
 
 class DBFetcher:
 
-    def __init__(self, db_name: str = DBConfig.DB_NAME):
+    def __init__(self, db_name: Optional[str] = None):
+        db_name = DBConfig.DB_NAME if db_name is None else db_name
         self._db_name = db_name
         self.db = DB(db_name)
 
@@ -30,6 +33,12 @@ class DBFetcher:
         # TODO - need to check if the columns are consistent
         return pd.read_sql(sql, self.conn)
 
+    def read_sql_params(self, sql: str, params: tuple | list | dict) -> pd.DataFrame:
+        """Same as read_sql but with the values bound to the ? placeholders in sql, so
+        SQLite can reuse the prepared statement and the values need no quoting"""
+        logger.debug("Fecthing df using the following query with params %s:\n%s", params, sql)
+        return pd.read_sql(sql, self.conn, params=params)
+
     # --------------------------------
     # Create a bunch of shortcuts to load data
     # TODO - considering if we need to factor them into a separate class
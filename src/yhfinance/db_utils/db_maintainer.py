@@ -12,7 +12,8 @@ logger = MyLogger(DBConfig.LOGGER_NAME)
 
 class DBMaintainer:
 
-    def __init__(self, db_name: str = DBConfig.DB_NAME):
+    def __init__(self, db_name: Optional[str] = None):
+        db_name = DBConfig.DB_NAME if db_name is None else db_name
         self._db_name = db_name
         self.db = DB(db_name)
         self.fetcher = DBFetcher(db_name)
@@ -87,9 +88,53 @@ class DBMaintainer:
             lambda tbl_name: self._maintain_unique_entries(tbl_name, dryrun=dryrun)
         )
 
+    def merge_from(self, other_db_name: str, include_meta: bool = True):
+        """Append all the known tables in another DB into this DB, e.g. the staging DB
+        written by a separate backup process. Missing tables / columns are created first
+        """
+
+        logger.info('Merging tables from DB %s', other_db_name)
+
+        conn = self.db.conn
+        conn.execute('ATTACH DATABASE ? AS staging', (other_db_name,))
+        try:
+            with conn:
+                for tbl_name in TableName.to_list(include_meta=include_meta):
+                    self._merge_table_from_staging(conn, tbl_name)
+        finally:
+            conn.execute('DETACH DATABASE staging')
+
+    def _merge_table_from_staging(self, conn, tbl_name: str):
+
+        staging_cols = conn.execute(f'PRAGMA staging.table_info([{tbl_name}])').fetchall()
+        if not staging_cols:
+            return
+
+        current_cols = {x[1] for x in conn.execute(f'PRAGMA main.table_info([{tbl_name}])').fetchall()}
+        if not current_cols:
+            logger.debug('Table %s does not exist, creating it from staging', tbl_name)
+            conn.execute(conn.execute(
+                "SELECT sql FROM staging.sqlite_master WHERE type = 'table' AND name = ?",
+                (tbl_name,)).fetchone()[0])
+            current_cols = {x[1] for x in staging_cols}
+
+        for _, col, _type, *_ in staging_cols:
+            if col not in current_cols:
+                logger.info('Adding new column %s (%s) to table %s', col, _type, tbl_name)
+                conn.execute(f'ALTER TABLE main.[{tbl_name}] ADD COLUMN [{col}] {_type}')
+
+        cols = ', '.join(f'[{x[1]}]' for x in staging_cols)
+        cur = conn.execute(
+            f'INSERT INTO main.[{tbl_name}] ({cols}) SELECT {cols} FROM staging.[{tbl_name}]')
+        logger.info('Merged %d rows into table %s', cur.rowcount, tbl_name)
+
     def _drop_all_tables(self, include_meta: bool = False):
 
         with self.db.conn as conn:
             for tbl_name in TableName.to_list(include_meta=include_meta):
                 logger.debug('Try to drop table %s', tbl_name)
                 conn.execute(f'DROP TABLE IF EXISTS {tbl_name}')
+
+        if include_meta:
+            # The meta table is gone, the next DB instance has to create it again
+            self.db.reset_meta_table_check()
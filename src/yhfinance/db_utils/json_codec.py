@@ -0,0 +1,33 @@
+"""JSON encoding of the dict columns stored in the DB, shared by the backup and the loaders
+"""
+
+from typing import Optional
+
+import orjson
+import zstandard
+
+
+def dumps_json(obj) -> str:
+    """Serialize obj to a JSON string with orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def loads_json(s: str | bytes):
+    """Deserialize a JSON string written by dumps_json"""
+    return orjson.loads(s)
+
+
+def dumps_info_json_zstd(info: dict) -> bytes:
+    """Serialize the info dict into the zstd compressed JSON stored in info_json_zstd"""
+    return zstandard.ZstdCompressor(level=3).compress(dumps_json(info).encode())
+
+
+def loads_info_json(info_json: Optional[str] = None,
+                    info_json_zstd: Optional[bytes] = None) -> Optional[dict]:
+    """Load the info dict saved by InfoData. New rows only have info_json_zstd, rows
+    written before it was introduced only have info_json. None if the row has neither"""
+    if info_json_zstd is not None:
+        info_json = zstandard.ZstdDecompressor().decompress(info_json_zstd)
+    if info_json is None:
+        return None
+    return orjson.loads(info_json)